@@ -6,6 +6,7 @@ Uses middleware-based authentication and security with organized router manageme
 
 import asyncio
 import os
+import sys
 import traceback
 from contextlib import asynccontextmanager
 
@@ -136,6 +137,20 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("🛑 Shutting down clipizy API...")
+
+    try:
+        from api.services.ai.runpod.queues_service import close_pod_manager
+        await close_pod_manager()
+    except Exception as e:
+        print(f"⚠️ RunPod client shutdown failed: {e}")
+
+    # Only close captcha solvers if something loaded them (the module pulls in Playwright/Selenium)
+    captcha_solver = sys.modules.get("api.services.utils.suno_captcha_solver")
+    if captcha_solver is not None:
+        try:
+            await captcha_solver.close_solvers()
+        except Exception as e:
+            print(f"⚠️ Captcha solver shutdown failed: {e}")
     
     # Queue manager removed
 
@@ -69,13 +69,8 @@ async def analyze_request(
             # In production, retrieve from Redis/DB
             # For now, try to get from the chatbot service's conversation history
             chatbot_service = get_chatbot_service()
-            current_config = {}
-            
-            # Try to find conversation in history
-            for conv in chatbot_service.conversation_history:
-                if conv.get("conversation_id") == request.conversation_id:
-                    current_config = conv.get("config", {})
-                    break
+            conv = chatbot_service.get_conversation(request.conversation_id)
+            current_config = conv.get("config", {}) if conv else {}
             
             result = await chatbot_service.continue_conversation(
                 conversation_id=request.conversation_id,
@@ -55,7 +55,7 @@ class MusicAnalysisQueueClient:
         req = self.queue.get_request(request_id)
         if not req:
             return None
-        return req.dict()
+        return req.to_dict()
 
 
 _music_client_instance: Optional[MusicAnalysisQueueClient] = None
@@ -1,9 +1,8 @@
 import asyncio
-import time
 from typing import Any, Dict, Optional, Union, List
 
-from api.services.ai.runpod.queues_service import get_queue_manager
-from api.schemas.ai.comfyui import WorkflowRequest, WorkflowType
+from api.services.ai.runpod.queues_service import QueuedRequest, get_queue_manager
+from api.schemas.ai.comfyui import WorkflowType
 
 
 class ImageQueueClient:
@@ -21,23 +20,19 @@ class ImageQueueClient:
         *,
         timeout_seconds: int = 300,
         poll_interval_seconds: float = 3.0,
-    ) -> WorkflowRequest:
+    ) -> QueuedRequest:
         await self.start()
         request_id = await self.queue.add_workflow_request(
             workflow_type.value,
             inputs,
             workflow_type,
         )
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            await asyncio.sleep(poll_interval_seconds)
-            req = self.queue.get_request(request_id) or self.queue.get_comfyui_request(request_id)
-            if not req:
-                continue
-            if req.status == "completed":
-                return req
-            if req.status == "failed":
-                raise Exception()
+        try:
+            req = await self.queue.wait_for_request(request_id, timeout_seconds)
+        except asyncio.TimeoutError:
+            raise Exception()
+        if req and req.status == "completed":
+            return req
         raise Exception()
 
     async def generate_image(
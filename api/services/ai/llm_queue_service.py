@@ -1,6 +1,5 @@
 import asyncio
-import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from api.services.ai.runpod.queues_service import get_queue_manager, RUNPOD_CONFIG
 from api.schemas.ai.comfyui import WorkflowRequest, WorkflowType
@@ -14,6 +13,29 @@ class LLMQueueClient:
         if not self.queue.isRunning:
             await self.queue.start()
 
+    def _timeout_for(self, workflow_name: str, default_timeout: int, timeout_seconds: Optional[int]) -> int:
+        if timeout_seconds is not None:
+            return timeout_seconds
+        llm_ollama_cfg = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
+        queue_cfg = llm_ollama_cfg.get(workflow_name, {})
+        return queue_cfg.get("generationTimeout", default_timeout)
+
+    async def _await_response(self, request_id: str, timeout_seconds: int) -> str:
+        try:
+            req = await self.queue.wait_for_request(request_id, timeout_seconds)
+        except asyncio.TimeoutError:
+            raise Exception(f"LLM request timed out after {timeout_seconds} seconds")
+
+        if req and req.status == "completed":
+            if req.result and isinstance(req.result, dict):
+                if req.result.get("response_text"):
+                    return req.result["response_text"]
+            if req.response_text:
+                return req.response_text
+            raise Exception("LLM request completed but no response text in result")
+        error_msg = (req.error if req else None) or "LLM request failed"
+        raise Exception(f"LLM request failed: {error_msg}")
+
     async def execute(
         self,
         prompt: str,
@@ -37,10 +59,7 @@ class LLMQueueClient:
             default_model = "mistral"
             default_timeout = 60
         
-        if timeout_seconds is None:
-            llm_ollama_cfg = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
-            queue_cfg = llm_ollama_cfg.get(workflow_name, {})
-            timeout_seconds = queue_cfg.get("generationTimeout", default_timeout)
+        timeout_seconds = self._timeout_for(workflow_name, default_timeout, timeout_seconds)
         
         inputs: Dict[str, Any] = {
             "prompt": prompt,
@@ -57,24 +76,43 @@ class LLMQueueClient:
             WorkflowType.OLLAMA_LLM,
         )
         
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            await asyncio.sleep(poll_interval_seconds)
-            req = self.queue.get_request(request_id) or self.queue.get_comfyui_request(request_id)
-            if not req:
-                continue
-            if req.status == "completed":
-                if req.result and isinstance(req.result, dict):
-                    if req.result.get("response_text"):
-                        return req.result["response_text"]
-                if req.response_text:
-                    return req.response_text
-                raise Exception("LLM request completed but no response text in result")
-            if req.status == "failed":
-                error_msg = req.error or "LLM request failed"
-                raise Exception(f"LLM request failed: {error_msg}")
-        
-        raise Exception(f"LLM request timed out after {timeout_seconds} seconds")
+        return await self._await_response(request_id, timeout_seconds)
+
+    async def execute_batch(
+        self,
+        prompts: List[str],
+        *,
+        model: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Run several text prompts that share the same model and timeout.
+
+        The Ollama pods have no batch endpoint, so every distinct prompt is still
+        its own queue request; they are enqueued together so the pod signal sees
+        the whole batch at once, and identical prompts share a single request.
+        Returns the response text or the raised exception for each prompt, in order.
+        """
+        await self.start()
+
+        workflow_name = "llm-mistral"
+        timeout_seconds = self._timeout_for(workflow_name, 60, timeout_seconds)
+        unique_prompts = list(dict.fromkeys(prompts))
+
+        request_ids = []
+        for prompt in unique_prompts:
+            request_ids.append(await self.queue.add_workflow_request(
+                workflow_name,
+                {"prompt": prompt, "model": model or "mistral"},
+                WorkflowType.OLLAMA_LLM,
+            ))
+
+        results = await asyncio.gather(
+            *(self._await_response(request_id, timeout_seconds) for request_id in request_ids),
+            return_exceptions=True,
+        )
+        by_prompt = dict(zip(unique_prompts, results))
+        return [by_prompt[prompt] for prompt in prompts]
 
 
 _llm_client_instance: Optional[LLMQueueClient] = None
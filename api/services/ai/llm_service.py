@@ -1,7 +1,8 @@
 import os
+import json
 import base64
 import logging
-from typing import Any, Dict, Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List
 
 import httpx
 
@@ -73,6 +74,18 @@ def _get_runpod_base_url(pod_id: str) -> str:
     return f"https://{pod_id}-8188.proxy.runpod.net"
 
 
+def _resolve_base_url(base_url: Optional[str], pod_id: Optional[str]) -> str:
+    if base_url is None:
+        if not pod_id:
+            raise ValueError(
+                "pod_id is required. Cannot use fallback pod ID. "
+                "Pod ID must be obtained from queue system via get_active_pod_for_workflow(). "
+                "If calling directly, you must pass a valid pod_id parameter."
+            )
+        base_url = _get_runpod_base_url(pod_id)
+    return base_url
+
+
 async def _download_image_bytes(image_url: str) -> bytes:
     """
     DOWNLOAD IMAGE BYTES FROM URL
@@ -160,14 +173,7 @@ async def generate_prompt(
     if not isinstance(prompt, str) or not prompt.strip():
         raise ValueError("prompt is required")
 
-    if base_url is None:
-        if not pod_id:
-            raise ValueError(
-                "pod_id is required. Cannot use fallback pod ID. "
-                "Pod ID must be obtained from queue system via get_active_pod_for_workflow(). "
-                "If calling directly, you must pass a valid pod_id parameter."
-            )
-        base_url = _get_runpod_base_url(pod_id)
+    base_url = _resolve_base_url(base_url, pod_id)
 
     # Quick connectivity check
     try:
@@ -318,4 +324,42 @@ async def generate_prompt(
             msg = first.get("message") if isinstance(first, dict) else None
             if isinstance(msg, dict) and isinstance(msg.get("content"), str):
                 return msg["content"]
-    raise Exception("No text response returned from model")
\ No newline at end of file
+    raise Exception("No text response returned from model")
+
+
+async def stream_prompt(
+    prompt: str,
+    *,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    pod_id: Optional[str] = None,
+    timeout_seconds: int = 300,
+) -> AsyncIterator[str]:
+    """
+    STREAM A TEXT PROMPT FROM THE OLLAMA /api/generate ENDPOINT
+    Yields response text chunks as the model decodes them. Closing the iterator
+    early (e.g. once the caller has parsed what it needs) closes the HTTP stream.
+    
+    Raises:
+        ValueError: If pod_id is not provided and base_url is not provided
+    """
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise ValueError("prompt is required")
+
+    base_url = _resolve_base_url(base_url, pod_id)
+    payload = {"model": model or "qwen3-vl", "prompt": prompt, "stream": True}
+
+    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+        async with client.stream("POST", f"{base_url}/api/generate", json=payload) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise Exception(f"LLM API request failed - {data['error']}")
+                chunk = data.get("response")
+                if chunk:
+                    yield chunk
+                if data.get("done"):
+                    break
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import logging
 import random
 import string
 import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, get_args
 import os
 from dotenv import load_dotenv
 import json
@@ -13,9 +17,13 @@ from pathlib import Path
 
 from pydantic import BaseModel, Field
 
-from api.schemas.ai.comfyui import WorkflowRequest, WorkflowType
+from api.schemas.ai.comfyui import WorkflowType
+from api.schemas.ai.runpod import RestPodConfig
 from api.services.ai.runpod.errors import ErrorCode
 
+if TYPE_CHECKING:
+    from api.services.ai.runpod.runpod_manager import PodManager
+
 # Load RunPod configuration for workflow settings
 RUNPOD_CONFIG_PATH = Path(__file__).resolve().parent / "config" / "runpod_config.json"
 try:
@@ -39,9 +47,41 @@ try:
 except Exception:
     pass
 
+logger = logging.getLogger(__name__)
+
+RUNPOD_API_KEY: Optional[str] = os.getenv("RUNPOD_API_KEY")
+
+
+def refresh_env() -> None:
+    """Re-read RUNPOD_API_KEY from the environment (e.g. after tests patch it)."""
+    global RUNPOD_API_KEY
+    RUNPOD_API_KEY = os.getenv("RUNPOD_API_KEY")
+
 StatusReq = Literal["pending", "processing", "completed", "failed"]
 
 
+@dataclass(slots=True)
+class QueuedRequest:
+    """Internal queue entry; mirrors WorkflowRequest without pydantic validation."""
+
+    id: str
+    workflow_type: Optional[WorkflowType]
+    inputs: Any
+    output_path: Optional[str] = None
+    status: str = "pending"
+    pod_id: Optional[str] = None
+    pod_ip: Optional[str] = None
+    prompt_id: Optional[str] = None
+    response_text: Optional[str] = None
+    error: Optional[str] = None
+    result: Any = None
+    completed_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain field dict, shaped like WorkflowRequest.dict()"""
+        return {name: getattr(self, name) for name in QueuedRequest.__slots__}
+
+
 class QueueStatus(BaseModel):
     activePods: List[Dict[str, Any]]
     pendingRequests: Dict[str, List[Dict[str, Any]]]
@@ -61,30 +101,35 @@ class MarkBody(BaseModel):
 
 
 class UnifiedQueueManager:
+    """In-memory workflow request queue.
+
+    The manager must only be accessed from a single event loop. None of its
+    critical sections await, so they run atomically with respect to other
+    coroutines and need no lock.
+    """
+
     def __init__(self) -> None:
-        self.pendingRequests: Dict[str, List[WorkflowRequest]] = {}
+        self.pendingRequests: Dict[str, deque[QueuedRequest]] = {}
         self.isRunning: bool = False
-        self._lock = asyncio.Lock()
-        self._requests_index: Dict[str, WorkflowRequest] = {}
-        self.comfyui_requests: Dict[str, WorkflowRequest] = {}
+        self._requests_index: Dict[str, QueuedRequest] = {}
+        self.comfyui_requests: Dict[str, QueuedRequest] = {}
+        self._done_events: Dict[str, asyncio.Event] = {}
+        # ComfyUI request ids bucketed by status so status counts are O(1)
+        self._comfy_by_status: Dict[str, set[str]] = {status: set() for status in get_args(StatusReq)}
 
     async def start(self) -> None:
-        async with self._lock:
-            if self.isRunning:
-                return
-            self.isRunning = True
+        self.isRunning = True
 
     async def stop(self) -> None:
-        async with self._lock:
-            if not self.isRunning:
-                return
-            self.isRunning = False
+        self.isRunning = False
 
     async def cleanup(self) -> None:
-        async with self._lock:
-            self.pendingRequests.clear()
-            self._requests_index.clear()
-            self.comfyui_requests.clear()
+        self.pendingRequests.clear()
+        self._requests_index.clear()
+        self.comfyui_requests.clear()
+        self._done_events.clear()
+        for ids in self._comfy_by_status.values():
+            ids.clear()
 
     async def add_workflow_request(
         self, workflow_name: str, request_data: Any, workflow_type: Optional[WorkflowType] = None
@@ -93,75 +138,122 @@ class UnifiedQueueManager:
         request_id = f"req_{int(time.time()*1000)}_" + "".join(
             random.choices(string.ascii_lowercase + string.digits, k=9)
         )
-        req = WorkflowRequest(id=request_id, workflow_type=workflow_type, inputs=request_data, status="pending")
-        async with self._lock:
-            self.pendingRequests.setdefault(workflow_key, []).append(req)
-            self._requests_index[request_id] = req
-            if workflow_type is not None:
-                self.comfyui_requests[request_id] = req
+        req = QueuedRequest(id=request_id, workflow_type=workflow_type, inputs=request_data)
+        self.pendingRequests.setdefault(workflow_key, deque()).append(req)
+        self._requests_index[request_id] = req
+        self._done_events[request_id] = asyncio.Event()
+        if workflow_type is not None:
+            self.comfyui_requests[request_id] = req
+            self._comfy_by_status["pending"].add(request_id)
         return request_id
 
+    def release_request(self, request_id: str) -> bool:
+        """Forget a finished request so the manager stops tracking it.
+
+        Callers holding the QueuedRequest keep a valid, unchanged object. A request
+        that finished before being dequeued stays in its pending deque until
+        dequeue_pending drops it.
+        """
+        req = self._requests_index.get(request_id)
+        if not req or req.status not in ("completed", "failed"):
+            return False
+        del self._requests_index[request_id]
+        if self.comfyui_requests.pop(request_id, None) is not None:
+            self._comfy_by_status[req.status].discard(request_id)
+        self._done_events.pop(request_id, None)
+        return True
+
     def get_queue_status(self) -> QueueStatus:
         pending: Dict[str, List[Dict[str, Any]]] = {}
         for name, reqs in self.pendingRequests.items():
-            pending[name] = [r.dict() for r in reqs if r.status == "pending"]
+            pending[name] = [r.to_dict() for r in reqs if r.status == "pending"]
 
+        by_status = self._comfy_by_status
         comfyui_status = {
             "total": len(self.comfyui_requests),
-            "active": len([r for r in self.comfyui_requests.values() if r.status in ("pending", "processing")]),
-            "completed": len([r for r in self.comfyui_requests.values() if r.status in ("completed", "failed")]),
-            "pending": len([r for r in self.comfyui_requests.values() if r.status == "pending"]),
+            "active": len(by_status["pending"]) + len(by_status["processing"]),
+            "completed": len(by_status["completed"]) + len(by_status["failed"]),
+            "pending": len(by_status["pending"]),
         }
 
-        return QueueStatus(activePods=[], pendingRequests=pending, isRunning=self.isRunning, comfyuiRequests=comfyui_status)
+        return QueueStatus.model_construct(
+            activePods=[], pendingRequests=pending, isRunning=self.isRunning, comfyuiRequests=comfyui_status
+        )
 
-    async def dequeue_pending(self, workflow_name: str, limit: Optional[int] = None) -> List[WorkflowRequest]:
+    async def dequeue_pending(self, workflow_name: str, limit: Optional[int] = None) -> List[QueuedRequest]:
         workflow_key = workflow_name.lower()
-        async with self._lock:
-            all_requests = self.pendingRequests.get(workflow_key, [])
-            pending = [r for r in all_requests if r.status == "pending"]
-            to_take = pending if limit is None else pending[: max(0, limit)]
-            if not to_take:
-                return []
-            remaining = [r for r in all_requests if r not in to_take]
-            self.pendingRequests[workflow_key] = remaining
-            for r in to_take:
-                r.status = "processing"
+        queue = self.pendingRequests.get(workflow_key)
+        if not queue:
+            return []
+        max_take = len(queue) if limit is None else max(0, limit)
+        to_take: List[QueuedRequest] = []
+        # Entries that already finished without being dequeued are dropped on the way
+        while queue and len(to_take) < max_take:
+            r = queue.popleft()
+            if r.status == "pending":
+                self._transition(r, "processing")
+                to_take.append(r)
         return to_take
 
-    def get_request(self, request_id: str) -> Optional[WorkflowRequest]:
+    def get_request(self, request_id: str) -> Optional[QueuedRequest]:
         return self._requests_index.get(request_id)
 
-    def get_comfyui_request(self, request_id: str) -> Optional[WorkflowRequest]:
+    def get_comfyui_request(self, request_id: str) -> Optional[QueuedRequest]:
         return self.comfyui_requests.get(request_id)
 
+    async def wait_for_request(self, request_id: str, timeout: float) -> Optional[QueuedRequest]:
+        """Wait until a request reaches a terminal status (completed/failed).
+
+        Raises asyncio.TimeoutError if the request does not finish within `timeout` seconds.
+        """
+        event = self._done_events.get(request_id)
+        if event is not None:
+            await asyncio.wait_for(event.wait(), timeout)
+        return self.get_request(request_id) or self.get_comfyui_request(request_id)
+
+    def _transition(self, req: QueuedRequest, new_status: StatusReq) -> None:
+        if req.id in self.comfyui_requests:
+            self._comfy_by_status[req.status].discard(req.id)
+            self._comfy_by_status[new_status].add(req.id)
+        req.status = new_status
+
+    def _signal_done(self, request_id: str) -> None:
+        event = self._done_events.get(request_id)
+        if event is not None:
+            event.set()
+
     def mark_request_completed(self, request_id: str, result: Any = None) -> bool:
         req = self._requests_index.get(request_id)
         if not req:
             return False
-        req.status = "completed"
+        self._transition(req, "completed")
         req.result = result
-        req.completed_at = datetime.fromtimestamp(time.time())
+        req.completed_at = datetime.now()
+        self._signal_done(request_id)
         return True
 
     def mark_request_failed(self, request_id: str, error: Optional[str] = None) -> bool:
         req = self._requests_index.get(request_id)
         if not req:
             return False
-        req.status = "failed"
+        self._transition(req, "failed")
         req.error = error
-        req.completed_at = datetime.fromtimestamp(time.time())
+        req.completed_at = datetime.now()
+        self._signal_done(request_id)
         return True
 
     # --- compatibility helpers with legacy manager ---
-    def get_all_comfyui_requests(self) -> List[WorkflowRequest]:
+    def get_all_comfyui_requests(self) -> List[QueuedRequest]:
         return list(self.comfyui_requests.values())
 
-    def get_active_comfyui_requests(self) -> List[WorkflowRequest]:
-        return [r for r in self.comfyui_requests.values() if r.status in ("pending", "processing")]
+    def get_active_comfyui_requests(self) -> List[QueuedRequest]:
+        return self._comfyui_requests_with_status("pending", "processing")
+
+    def get_completed_comfyui_requests(self) -> List[QueuedRequest]:
+        return self._comfyui_requests_with_status("completed", "failed")
 
-    def get_completed_comfyui_requests(self) -> List[WorkflowRequest]:
-        return [r for r in self.comfyui_requests.values() if r.status in ("completed", "failed")]
+    def _comfyui_requests_with_status(self, *statuses: str) -> List[QueuedRequest]:
+        return [self.comfyui_requests[rid] for status in statuses for rid in self._comfy_by_status[status]]
 
     def get_max_queue_size(self, workflow_name: str) -> int:
         if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
@@ -182,28 +274,82 @@ def get_queue_manager() -> UnifiedQueueManager:
     return _manager_instance
 
 
-async def _get_active_pods_for_workflow(workflow_name: str) -> List[Dict[str, Any]]:
-    """
-    Query RunPod API for active pods matching the workflow.
-    Returns list of pods that match the workflow by name pattern or template.
-    """
-    print(f"[runpod][signal] _get_active_pods_for_workflow called for '{workflow_name}'")
-    api_key = os.getenv("RUNPOD_API_KEY")
-    if not api_key:
-        print(f"[runpod][signal] No API key found, returning empty list")
-        return []
+ACTIVE_POD_STATUSES = frozenset(("RUNNING", "STARTING"))
 
-    try:
+# Age after which compute_pod_signal recounts pods before creating a new one
+POD_RECOUNT_AFTER_SECONDS = 5.0
+
+# Short-lived snapshot of all RunPod pods shared by every workflow's signal
+ALL_PODS_CACHE_TTL_SECONDS = 2.0
+_all_pods_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+_all_pods_lock = asyncio.Lock()
+_pod_filters: Dict[str, Tuple[str, Optional[str]]] = {}
+# Long-lived RunPod REST client so signals reuse its keep-alive connections
+_pod_manager: Optional[PodManager] = None
+
+
+def _get_pod_filter(workflow_name: str) -> Tuple[str, Optional[str]]:
+    """Return the (name_prefix, template_id) pair used to match a workflow's pods."""
+    pod_filter = _pod_filters.get(workflow_name)
+    if pod_filter is None:
+        if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
+            wf_settings = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
+        else:
+            wf_settings = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {})
+        pod_filter = (f"{workflow_name}-auto-", wf_settings.get("template"))
+        _pod_filters[workflow_name] = pod_filter
+    return pod_filter
+
+
+async def _get_pod_manager(api_key: str) -> PodManager:
+    global _pod_manager
+    if _pod_manager is None or _pod_manager.api_key != api_key:
         from api.services.ai.runpod.runpod_manager import PodManager
-        
-        print(f"[runpod][signal] Querying RunPod API for all pods...")
-        manager_rest = PodManager(api_key)
-        pods_response = await manager_rest.get_pods()
+
+        # Swap before awaiting so concurrent callers never see (or re-close) the closing client
+        old_manager, manager = _pod_manager, PodManager(api_key)
+        _pod_manager = manager
+        if old_manager is not None:
+            await old_manager.close()
+        return manager
+    return _pod_manager
+
+
+async def close_pod_manager() -> None:
+    """Close the shared RunPod REST client (call on application shutdown)."""
+    global _pod_manager
+    if _pod_manager is not None:
+        manager_rest, _pod_manager = _pod_manager, None
         await manager_rest.close()
-        
-        print(f"[runpod][signal] RunPod API response type: {type(pods_response)}")
-        print(f"[runpod][signal] RunPod API response (first 500 chars): {str(pods_response)[:500]}")
-        
+
+
+def _invalidate_pods_cache() -> None:
+    global _all_pods_cache
+    _all_pods_cache = None
+
+
+async def _get_all_pods(api_key: str) -> List[Dict[str, Any]]:
+    """
+    Fetch all pods from the RunPod API, reusing a snapshot younger than
+    ALL_PODS_CACHE_TTL_SECONDS so concurrent per-workflow signals share one request.
+    """
+    global _all_pods_cache
+    cached = _all_pods_cache
+    if cached is not None and time.monotonic() - cached[0] < ALL_PODS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    async with _all_pods_lock:
+        cached = _all_pods_cache
+        if cached is not None and time.monotonic() - cached[0] < ALL_PODS_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        logger.debug("[runpod][signal] Querying RunPod API for all pods")
+        manager_rest = await _get_pod_manager(api_key)
+        pods_response = await manager_rest.get_pods()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[runpod][signal] RunPod API response (%s): %s", type(pods_response).__name__, str(pods_response)[:500])
+
         if isinstance(pods_response, list):
             all_pods = pods_response
         elif isinstance(pods_response, dict):
@@ -212,49 +358,117 @@ async def _get_active_pods_for_workflow(workflow_name: str) -> List[Dict[str, An
                 all_pods = pods_response.get("data", [])
         else:
             all_pods = []
-        print(f"[runpod][signal] Found {len(all_pods)} total pods from RunPod API")
-        
-        if len(all_pods) > 0:
-            print(f"[runpod][signal] Sample pod (first): {str(all_pods[0])[:200] if all_pods else 'N/A'}")
-        
+        logger.debug("[runpod][signal] Found %d total pods from RunPod API", len(all_pods))
+
+        _all_pods_cache = (time.monotonic(), all_pods)
+        return all_pods
+
+
+async def _get_active_pods_for_workflow(workflow_name: str) -> List[Dict[str, Any]]:
+    """
+    Query RunPod API for active pods matching the workflow.
+    Returns list of pods that match the workflow by name pattern or template.
+    """
+    api_key = RUNPOD_API_KEY
+    if not api_key:
+        logger.debug("[runpod][signal] No API key found, returning empty list")
+        return []
+
+    try:
+        all_pods = await _get_all_pods(api_key)
+
         if not all_pods:
-            print(f"[runpod][signal] No pods found in response, returning empty list")
             return []
 
-        if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
-            wf_settings = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
-        else:
-            wf_settings = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {})
-        template_id = wf_settings.get("template")
-        
-        active_pods = []
-        name_prefix = f"{workflow_name}-auto-"
-        
-        print(f"[runpod][signal] Checking pods for workflow '{workflow_name}' (name_prefix='{name_prefix}', template_id='{template_id}')")
-        
-        for pod in all_pods:
-            pod_name = pod.get("name", "")
-            pod_template = pod.get("templateId")
-            pod_status = pod.get("desiredStatus", "").upper()
-            
-            matches_name = pod_name.startswith(name_prefix)
-            matches_template = template_id and pod_template == template_id
-            
-            if (matches_name or matches_template) and pod_status in ["RUNNING", "STARTING"]:
-                print(f"[runpod][signal] Found active pod: {pod_name} (status: {pod_status}, template: {pod_template})")
-                active_pods.append(pod)
-            elif matches_name or matches_template:
-                print(f"[runpod][signal] Found matching pod but not active: {pod_name} (status: {pod_status})")
-        
-        print(f"[runpod][signal] Total active pods for '{workflow_name}': {len(active_pods)}")
+        name_prefix, template_id = _get_pod_filter(workflow_name)
+        active_pods = [
+            pod
+            for pod in all_pods
+            if (pod.get("name", "").startswith(name_prefix) or (template_id and pod.get("templateId") == template_id))
+            and pod.get("desiredStatus", "").upper() in ACTIVE_POD_STATUSES
+        ]
+        logger.debug("[runpod][signal] Total active pods for '%s': %d", workflow_name, len(active_pods))
         return active_pods
-    except Exception as e:
-        import traceback
-        print(f"[runpod][signal] Error querying active pods: {e}")
-        print(f"[runpod][signal] Traceback: {traceback.format_exc()}")
+    except Exception:
+        logger.exception("[runpod][signal] Error querying active pods")
         return []
 
 
+_pod_config_templates: Dict[str, RestPodConfig] = {}
+
+
+def _build_pod_config(workflow_name: str) -> RestPodConfig:
+    """
+    Resolve RUNPOD_CONFIG into the pod creation config for a workflow.
+    The result is cached as a template; callers only override the pod name.
+    """
+    pod_settings = RUNPOD_CONFIG.get("podSettings", {})
+    if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
+        wf_settings = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {}) or RUNPOD_CONFIG.get("workflow", {}).get("default", {})
+    else:
+        wf_settings = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {}) or RUNPOD_CONFIG.get("workflow", {}).get("default", {})
+    # Normalize pod settings keys to what RestPodConfig expects
+    # Priority: workflow-specific docker_image > default_docker_image
+    default_image = (
+        wf_settings.get("docker_image")
+        or pod_settings.get("defaultImage")
+        or pod_settings.get("default_docker_image")
+    )
+    logger.debug("[runpod][signal] docker_image (priority: workflow > default): %s", default_image)
+    default_disk_gb = (
+        pod_settings.get("defaultDiskInGb")
+        or pod_settings.get("default_container_disk_size")
+        or 20
+    )
+    default_gpu_count = pod_settings.get("defaultGpuCount", 1)
+    default_mem_gb = (
+        pod_settings.get("defaultMemoryInGb")
+        or pod_settings.get("default_memory_in_gb")
+    )
+    default_ports = pod_settings.get("defaultPorts") or pod_settings.get("default_ports")
+    template_id = wf_settings.get("template")
+    logger.debug("[runpod][signal] template_id=%s, network-volume=%s", template_id, wf_settings.get("network-volume"))
+
+    # Best-effort config using templateId, optionally gpuTypeIds from config
+    raw_gpu_ids = wf_settings.get("gpuTypeIds")
+    gpu_type_ids: Optional[List[str]] = None
+    if isinstance(raw_gpu_ids, list):
+        if raw_gpu_ids and isinstance(raw_gpu_ids[0], dict):
+            gpu_type_ids = [str(item.get("id")) for item in raw_gpu_ids if item.get("id")]
+        else:
+            gpu_type_ids = [str(x) for x in raw_gpu_ids]
+
+    ports = ["8188/http"]
+    if default_ports:
+        if isinstance(default_ports, str):
+            ports = [default_ports]
+        elif isinstance(default_ports, list):
+            ports = [str(p) for p in default_ports if p]
+
+    network_volume_id = wf_settings.get("network-volume") or pod_settings.get("networkVolumeId")
+    volume_mount_path = pod_settings.get("defaultVolumeMountPath") or pod_settings.get("default_volume_mount_path") or "/workspace"
+
+    return RestPodConfig(
+        gpuTypeIds=gpu_type_ids,
+        imageName=default_image,
+        name=f"{workflow_name}-auto",
+        env={
+            "PYTHONUNBUFFERED": "1",
+            "JUPYTER_PASSWORD": "secure-password-123",
+            "OLLAMA_HOST": "0.0.0.0:8188",
+        },
+        containerDiskInGb=int(default_disk_gb),
+        volumeInGb=None if network_volume_id else int(default_disk_gb),
+        volumeMountPath=volume_mount_path,
+        networkVolumeId=network_volume_id,
+        gpuCount=int(default_gpu_count),
+        minMemoryInGb=int(default_mem_gb) if default_mem_gb is not None else None,
+        supportPublicIp=pod_settings.get("supportPublicIp", True),
+        ports=ports,
+        templateId=template_id,
+    )
+
+
 # CENTRAL SIGNAL/HEALTH CHECK
 async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
     """
@@ -264,33 +478,42 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
     if not workflow_name:
         raise ValueError("workflow_name is required")
 
-    print("[runpod][signal] ▶ compute_pod_signal called")
-    print(f"[runpod][signal] workflow_name: {workflow_name}")
-    manager = get_queue_manager()
-    await manager.start()
+    logger.debug("[runpod][signal] compute_pod_signal called for '%s'", workflow_name)
+    # The RunPod REST call is the slowest step; start it before the local queue work
+    pods_task = asyncio.create_task(_get_active_pods_for_workflow(workflow_name))
+    try:
+        manager = get_queue_manager()
+        await manager.start()
 
-    if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
-        llm_ollama_cfg = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
-        queue_cfg = llm_ollama_cfg.get(workflow_name, {})
-        max_queue_size = int(queue_cfg.get("maxQueueSize", 3))
-        max_pods = int(queue_cfg.get("maxConcurrentPods", 1))
-    else:
-        wf_cfg = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {})
-        max_queue_size = int(wf_cfg.get("maxQueueSize", 3))
-        max_pods = int(wf_cfg.get("maxConcurrentPods", 1))
-    print(f"[runpod][signal] config → maxQueueSize={max_queue_size}, maxConcurrentPods={max_pods}")
-
-    status = manager.get_queue_status()
-    pending_for_wf = status.pendingRequests.get(workflow_name.lower(), [])
-    queue_size = len(pending_for_wf)
-    
-    active_pods_list = await _get_active_pods_for_workflow(workflow_name)
+        if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
+            llm_ollama_cfg = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {})
+            queue_cfg = llm_ollama_cfg.get(workflow_name, {})
+            max_queue_size = int(queue_cfg.get("maxQueueSize", 3))
+            max_pods = int(queue_cfg.get("maxConcurrentPods", 1))
+        else:
+            wf_cfg = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {})
+            max_queue_size = int(wf_cfg.get("maxQueueSize", 3))
+            max_pods = int(wf_cfg.get("maxConcurrentPods", 1))
+        logger.debug("[runpod][signal] config: maxQueueSize=%d, maxConcurrentPods=%d", max_queue_size, max_pods)
+
+        status = manager.get_queue_status()
+        pending_for_wf = status.pendingRequests.get(workflow_name.lower(), [])
+        queue_size = len(pending_for_wf)
+    except BaseException:
+        # Don't leave the RunPod fetch running unobserved if the local setup fails
+        pods_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await pods_task
+        raise
+
+    active_pods_list = await pods_task
     active_pods_count = len(active_pods_list)
-    print(f"[runpod][signal] queue_size={queue_size}, activePods={active_pods_count}")
+    pods_counted_at = time.monotonic()
+    logger.debug("[runpod][signal] queue_size=%d, activePods=%d", queue_size, active_pods_count)
 
     if queue_size < max_queue_size:
         if active_pods_count > 0:
-            print(f"[runpod][signal] DECISION: available (below queue threshold, {active_pods_count} active pods exist)")
+            logger.debug("[runpod][signal] DECISION: available (below queue threshold, %d active pods exist)", active_pods_count)
             return {
                 "success": True,
                 "message": "Pod available",
@@ -300,9 +523,9 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
                 "action": "available",
             }
         elif max_pods > 0:
-            print("[runpod][signal] DECISION: no active pods → attempt creation preemptively")
+            logger.debug("[runpod][signal] DECISION: no active pods, attempt creation preemptively")
         else:
-            print("[runpod][signal] DECISION: available (below queue threshold)")
+            logger.debug("[runpod][signal] DECISION: available (below queue threshold)")
             return {
                 "success": True,
                 "message": "Pod available",
@@ -316,9 +539,9 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
         if active_pods_count > 0:
             current_pod_count = active_pods_count
             if current_pod_count < max_pods:
-                print(f"[runpod][signal] DECISION: {current_pod_count}/{max_pods} pods active, can create more")
+                logger.debug("[runpod][signal] DECISION: %d/%d pods active, can create more", current_pod_count, max_pods)
             else:
-                print(f"[runpod][signal] DECISION: max pods reached ({current_pod_count}/{max_pods}), no new pod needed")
+                logger.debug("[runpod][signal] DECISION: max pods reached (%d/%d), no new pod needed", current_pod_count, max_pods)
                 return {
                     "success": True,
                     "message": f"Max pods reached ({current_pod_count}/{max_pods})",
@@ -328,96 +551,25 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
                     "action": "max_pods_reached",
                 }
         # Try to actually recruit/start a pod using RunPod REST API if configured
-        api_key = os.getenv("RUNPOD_API_KEY")
-        print(f"[runpod][signal] scale allowed; has_api_key={bool(api_key)}")
+        api_key = RUNPOD_API_KEY
+        logger.debug("[runpod][signal] scale allowed; has_api_key=%s", bool(api_key))
         try:
             if api_key:
-                from api.services.ai.runpod.runpod_manager import PodManager
-                from api.schemas.ai.runpod import RestPodConfig
-
-                pod_settings = RUNPOD_CONFIG.get("podSettings", {})
-                if workflow_name in ("llm-mistral", "llm-qwen3-vl"):
-                    wf_settings = RUNPOD_CONFIG.get("workflow", {}).get("llm-ollama", {}) or RUNPOD_CONFIG.get("workflow", {}).get("default", {})
-                else:
-                    wf_settings = RUNPOD_CONFIG.get("workflow", {}).get(workflow_name, {}) or RUNPOD_CONFIG.get("workflow", {}).get("default", {})
-                # Normalize pod settings keys to what RestPodConfig expects
-                # Priority: workflow-specific docker_image > default_docker_image
-                default_image = (
-                    wf_settings.get("docker_image")
-                    or pod_settings.get("defaultImage")
-                    or pod_settings.get("default_docker_image")
-                )
-                print(f"[runpod][signal] docker_image (priority: workflow > default): {default_image}")
-                default_disk_gb = (
-                    pod_settings.get("defaultDiskInGb")
-                    or pod_settings.get("default_container_disk_size")
-                    or 20
-                )
-                default_gpu_count = pod_settings.get("defaultGpuCount", 1)
-                default_mem_gb = (
-                    pod_settings.get("defaultMemoryInGb")
-                    or pod_settings.get("default_memory_in_gb")
-                )
-                default_country = (
-                    pod_settings.get("defaultCountryCode")
-                    or pod_settings.get("default_region")
-                )
-                default_vcpu = (
-                    pod_settings.get("defaultVcpuCount")
-                    or pod_settings.get("vcpuCount")
-                    or 4
-                )
-                default_ports = pod_settings.get("defaultPorts") or pod_settings.get("default_ports")
-                template_id = wf_settings.get("template")
-                print(f"[runpod][signal] template_id={template_id}, network-volume={wf_settings.get('network-volume')}")
-                print(f"[runpod][signal] pod_settings summary: gpu={pod_settings.get('defaultGpuCount')}, mem={pod_settings.get('defaultMemoryInGb')}GB, disk={pod_settings.get('defaultDiskInGb')}GB, ports={pod_settings.get('defaultPorts')}")
-
-                manager_rest = PodManager(api_key)
-
-                # Best-effort config using templateId, optionally gpuTypeIds from config
-                raw_gpu_ids = wf_settings.get("gpuTypeIds")
-                gpu_type_ids: Optional[List[str]] = None
-                if isinstance(raw_gpu_ids, list):
-                    if raw_gpu_ids and isinstance(raw_gpu_ids[0], dict):
-                        gpu_type_ids = [str(item.get("id")) for item in raw_gpu_ids if item.get("id")]
-                    else:
-                        gpu_type_ids = [str(x) for x in raw_gpu_ids]
-
-                ports = ["8188/http"]
-                if default_ports:
-                    if isinstance(default_ports, str):
-                        ports = [default_ports]
-                    elif isinstance(default_ports, list):
-                        ports = [str(p) for p in default_ports if p]
-
-                network_volume_id = wf_settings.get("network-volume") or pod_settings.get("networkVolumeId")
-                volume_mount_path = pod_settings.get("defaultVolumeMountPath") or pod_settings.get("default_volume_mount_path") or "/workspace"
-
-                pod_config = RestPodConfig(
-                    gpuTypeIds=gpu_type_ids,
-                    imageName=default_image,
-                    name=f"{workflow_name}-auto-{int(time.time())}",
-                    env={
-                        "PYTHONUNBUFFERED": "1",
-                        "JUPYTER_PASSWORD": "secure-password-123",
-                        "OLLAMA_HOST": "0.0.0.0:8188",
-                    },
-                    containerDiskInGb=int(default_disk_gb),
-                    volumeInGb=None if network_volume_id else int(default_disk_gb),
-                    volumeMountPath=volume_mount_path,
-                    networkVolumeId=network_volume_id,
-                    gpuCount=int(default_gpu_count),
-                    minMemoryInGb=int(default_mem_gb) if default_mem_gb is not None else None,
-                    supportPublicIp=pod_settings.get("supportPublicIp", True),
-                    ports=ports,
-                    templateId=template_id,
-                )
-
-                current_pod_count = len(await _get_active_pods_for_workflow(workflow_name))
+                template = _pod_config_templates.get(workflow_name)
+                if template is None:
+                    template = _build_pod_config(workflow_name)
+                    _pod_config_templates[workflow_name] = template
+                pod_config = template.model_copy(update={"name": f"{workflow_name}-auto-{int(time.time())}"})
+
+                manager_rest = await _get_pod_manager(api_key)
+
+                # Reuse the count fetched above unless it has gone stale
+                current_pod_count = active_pods_count
+                if time.monotonic() - pods_counted_at > POD_RECOUNT_AFTER_SECONDS:
+                    current_pod_count = len(await _get_active_pods_for_workflow(workflow_name))
                 
                 if current_pod_count >= max_pods:
-                    print(f"[runpod][signal] DECISION: max pods already reached ({current_pod_count}/{max_pods}), skipping creation")
-                    await manager_rest.close()
+                    logger.debug("[runpod][signal] DECISION: max pods already reached (%d/%d), skipping creation", current_pod_count, max_pods)
                     return {
                         "success": True,
                         "message": f"Max pods already reached ({current_pod_count}/{max_pods})",
@@ -428,15 +580,14 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
                     }
 
                 try:
-                    print(f"[runpod][signal] ▶ creating pod via RunPod REST... (current: {current_pod_count}/{max_pods})")
+                    logger.info("[runpod][signal] Creating pod for '%s' via RunPod REST (current: %d/%d)", workflow_name, current_pod_count, max_pods)
                     resp = await manager_rest.create_pod(pod_config)
-                    print(f"[runpod][signal] create_pod response: {resp}")
-                    await manager_rest.close()
+                    _invalidate_pods_cache()
+                    logger.debug("[runpod][signal] create_pod response: %s", resp)
                     action = "created"
                     message = "Pod creation requested"
                 except Exception as _e:
-                    print(f"[runpod][signal] create_pod failed: {_e}")
-                    await manager_rest.close()
+                    logger.warning("[runpod][signal] create_pod failed: %s", _e)
                     action = "created"
                     message = f"Pod create attempted: {_e}"
 
@@ -450,11 +601,11 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
                     "runpodResponse": locals().get("resp")
                 }
         except Exception as _:
-            print(f"[runpod][signal] scale attempt failed, falling back to capacity reached path")
+            logger.exception("[runpod][signal] scale attempt failed, falling back to capacity reached path")
             # Fall through to capacity reached if creation fails
             pass
 
-        print("[runpod][signal] DECISION: created (no API configured; simulated scale)")
+        logger.debug("[runpod][signal] DECISION: created (no API configured; simulated scale)")
         return {
             "success": True,
             "message": "Scale up possible but no API configured",
@@ -464,7 +615,7 @@ async def compute_pod_signal(workflow_name: str) -> Dict[str, Any]:
             "action": "created",
         }
 
-    print("[runpod][signal] DECISION: max_pods_reached (at capacity)")
+    logger.debug("[runpod][signal] DECISION: max_pods_reached (at capacity)")
     return {
         "success": False,
         "message": f"All pods at capacity. Queue size: {queue_size}/{max_queue_size}",
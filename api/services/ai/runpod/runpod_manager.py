@@ -2,6 +2,11 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:
+    h2 = None
+
 from api.schemas.ai.runpod import RestPodConfig
 
 
@@ -9,9 +14,16 @@ class PodManager:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.rest_url = "https://rest.runpod.io/v1"
+        # HTTP/2 (when h2 is installed) lets concurrent admin calls share one TLS
+        # connection; the transport retries once on connection-level failures
         self.client = httpx.AsyncClient(
             headers={"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"},
             timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                http2=h2 is not None,
+                limits=httpx.Limits(max_keepalive_connections=10),
+                retries=1,
+            ),
         )
 
     async def close(self) -> None:
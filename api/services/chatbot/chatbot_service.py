@@ -1,18 +1,79 @@
+import asyncio
 import json
 import logging
+import os
+import re
 import uuid
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from collections import deque
+from contextlib import aclosing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
 
-from api.services.ai.llm_service import generate_prompt
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from api.services.ai.llm_service import generate_prompt, stream_prompt
+from api.services.chatbot.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+MAX_CONVERSATIONS = 512
+MAX_STORED_RESPONSE_CHARS = 4096
+LLM_WORKFLOW = "llm-mistral"
+
+# Keyword patterns for requests that are unambiguous enough to skip the LLM
+PROJECT_TYPE_RE = re.compile(
+    r"\b(?:(?P<music_video_clip>music[- ]video)|(?P<business_ad>business[- ]ad|advert(?:isement)?)"
+    r"|(?P<automate_workflow>automat(?:e|ion)[- ]workflow)|(?P<video_clip>video[- ]clip))\b",
+    re.I
+)
+VIDEO_TYPE_RE = re.compile(r"\b(looped[- ]static|looped[- ]animated|recurring[- ]scenes)\b", re.I)
+STYLE_RE = re.compile(r"\b(cinematic|abstract|vibrant|minimal)\b", re.I)
+DURATION_RE = re.compile(r"\b(\d{1,3})\s*(?:s|sec|secs|seconds)\b", re.I)
+
+# Fields that must be filled before generation, per project type
+_DEFAULT_REQUIRED_FIELDS = ("project_type", "visual_style", "duration")
+_REQUIRED_FIELDS = {
+    "music_video_clip": ("project_type", "video_type", "visual_style", "duration"),
+}
+_MISSING_PROMPT = {
+    "project_type": "What type of project would you like to create? (music video, video clip, business ad, etc.)",
+    "video_type": "What type of video would you like? (static, animated, or scene-based)",
+    "visual_style": "What visual style are you looking for? (e.g., cinematic, abstract, vibrant, minimal)",
+    "duration": "What duration would you like for your video? (in seconds)",
+}
+
+# Markdown code fences wrapped around JSON answers
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.MULTILINE)
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps_indented(obj: Any) -> str:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
 class ChatbotService:
     """Service for analyzing user input and determining project configuration"""
     
     def __init__(self):
-        self.conversation_history: List[Dict[str, Any]] = []
+        self._history: deque = deque(maxlen=MAX_CONVERSATIONS)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self.response_cache = SemanticCache(
+            use_redis=os.getenv("CHATBOT_CACHE_REDIS", "false").lower() == "true"
+        )
+        self._direct_hits = 0
+        self._direct_misses = 0
     
     async def analyze_request(
         self,
@@ -28,28 +89,55 @@ class ChatbotService:
             if not conversation_id:
                 conversation_id = str(uuid.uuid4())
             
-            analysis_prompt = self._build_analysis_prompt(
-                user_input=user_input,
-                input_tracks=input_tracks,
-                input_images=input_images,
-                user_subscription_tier=user_subscription_tier
-            )
-            
-            raw_response = await generate_prompt(analysis_prompt)
+            direct_config = self._direct_config(user_input, input_tracks, input_images)
             
-            config = self._parse_llm_response(raw_response, input_tracks, input_images)
+            if direct_config is not None:
+                raw_response = None
+                config = direct_config
+            else:
+                cache_key = SemanticCache.make_key(user_input, input_tracks, input_images, user_subscription_tier)
+                cache_context = (input_tracks, input_images, user_subscription_tier)
+                embedding = None
+                cached_config = await self.response_cache.get(cache_key, cache_context)
+                if cached_config is None:
+                    # Only pay for the embedding when the exact lookup misses; it is CPU
+                    # bound, so run it on the loop's default executor
+                    embedding = await asyncio.get_running_loop().run_in_executor(
+                        None, self.response_cache.embed, user_input
+                    )
+                    cached_config = self.response_cache.get_similar(cache_context, embedding)
+                
+                if cached_config is not None:
+                    logger.info("Chatbot analysis served from cache")
+                    raw_response = None
+                    config = dict(cached_config)
+                else:
+                    analysis_prompt = self._build_analysis_prompt(
+                        user_input=user_input,
+                        input_tracks=input_tracks,
+                        input_images=input_images,
+                        user_subscription_tier=user_subscription_tier
+                    )
+                    
+                    raw_response, streamed_config = await self._stream_llm_config(analysis_prompt)
+                    
+                    if streamed_config is not None:
+                        config, parsed = self._apply_config_defaults(streamed_config, input_tracks, input_images), True
+                    else:
+                        config, parsed = self._parse_llm_response_checked(raw_response, input_tracks, input_images)
+                    if parsed:
+                        await self.response_cache.set(cache_key, cache_context, dict(config), embedding)
             
-            needs_clarification = self._check_if_clarification_needed(config)
-            missing_fields = self._get_missing_fields(config) if needs_clarification else []
+            needs_clarification, missing_fields = self._evaluate_config(config)
             
             conversation_entry = {
                 "conversation_id": conversation_id,
                 "user_input": user_input,
                 "config": config,
-                "timestamp": datetime.utcnow().isoformat(),
-                "raw_response": raw_response
+                "timestamp": _now_iso(),
+                "raw_response": raw_response[:MAX_STORED_RESPONSE_CHARS] if raw_response else raw_response
             }
-            self.conversation_history.append(conversation_entry)
+            self._remember(conversation_entry)
             
             return {
                 "success": True,
@@ -96,15 +184,15 @@ class ChatbotService:
                 user_response=user_response
             )
             
-            needs_clarification = self._check_if_clarification_needed(updated_config)
-            missing_fields = self._get_missing_fields(updated_config) if needs_clarification else []
+            needs_clarification, missing_fields = self._evaluate_config(updated_config)
             
-            for conv in self.conversation_history:
-                if conv.get("conversation_id") == conversation_id:
-                    conv["config"] = updated_config
-                    conv["user_response"] = user_response
-                    conv["timestamp"] = datetime.utcnow().isoformat()
-                    break
+            conv = self._by_id.get(conversation_id)
+            if conv:
+                conv.update(
+                    config=updated_config,
+                    user_response=user_response,
+                    timestamp=_now_iso()
+                )
             
             return {
                 "success": True,
@@ -125,6 +213,28 @@ class ChatbotService:
                 "needs_clarification": True
             }
     
+    async def run_llm_batch(self, items: List[Dict[str, Any]]) -> List[Any]:
+        """Fire independent workflow LLM requests in parallel (see LLMRequestHandler.process_requests_batch)"""
+        
+        from api.services.chatbot.llm_requests.llm_requests import get_llm_request_handler
+        
+        return await get_llm_request_handler().process_requests_batch(items)
+    
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a stored conversation entry by id"""
+        
+        return self._by_id.get(conversation_id)
+    
+    def _remember(self, entry: Dict[str, Any]) -> None:
+        """Append to the bounded history, dropping the oldest entry from the index"""
+        
+        if len(self._history) == self._history.maxlen:
+            oldest = self._history[0]
+            if self._by_id.get(oldest["conversation_id"]) is oldest:
+                del self._by_id[oldest["conversation_id"]]
+        self._history.append(entry)
+        self._by_id[entry["conversation_id"]] = entry
+    
     def _build_analysis_prompt(
         self,
         user_input: str,
@@ -177,7 +287,7 @@ class ChatbotService:
         prompt = f"""Update the project configuration based on the user's response to a clarification question.
 
         Current Configuration:
-        {json.dumps(current_config, indent=2)}
+        {_json_dumps_indented(current_config)}
 
         User Response: "{user_response}"
 
@@ -204,32 +314,127 @@ class ChatbotService:
     def _parse_llm_response(self, response: str, input_tracks: int, input_images: int) -> Dict[str, Any]:
         """Parse LLM response into configuration dict"""
         
-        try:
-            cleaned_response = response.strip()
-            
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response.replace("```json", "").replace("```", "").strip()
-            elif cleaned_response.startswith("```"):
-                cleaned_response = cleaned_response.replace("```", "").strip()
-            
-            config = json.loads(cleaned_response)
-            
-            defaults = {
-                "project_type": "music_video_clip" if input_tracks > 0 else "video_clip",
-                "visual_style": "cinematic",
-                "duration": 30,
-                "prompt_user_input": "",
+        return self._parse_llm_response_checked(response, input_tracks, input_images)[0]
+    
+    def _direct_config(
+        self, user_input: str, input_tracks: int, input_images: int
+    ) -> Optional[Dict[str, Any]]:
+        """Build the config without the LLM when every required field is stated explicitly"""
+        
+        config = None
+        project_match = PROJECT_TYPE_RE.search(user_input)
+        project_type = "music_video_clip" if input_tracks > 0 else (project_match.lastgroup if project_match else None)
+        style_match = STYLE_RE.search(user_input)
+        duration_match = DURATION_RE.search(user_input)
+        
+        if project_type and style_match and duration_match and int(duration_match.group(1)) > 0:
+            config = {
+                "project_type": project_type,
+                "visual_style": style_match.group(1).lower(),
+                "duration": int(duration_match.group(1)),
+                "prompt_user_input": user_input.strip(),
                 "reference_images": input_images
             }
+            if project_type == "music_video_clip":
+                video_type_match = VIDEO_TYPE_RE.search(user_input)
+                if video_type_match:
+                    config["video_type"] = video_type_match.group(1).lower().replace(" ", "-")
+                else:
+                    config = None
+        
+        if config is None:
+            self._direct_misses += 1
+            return None
+        
+        self._direct_hits += 1
+        logger.info(
+            f"Chatbot analysis resolved without LLM "
+            f"({self._direct_hits}/{self._direct_hits + self._direct_misses} requests)"
+        )
+        return config
+    
+    async def _resolve_llm_pod(self) -> str:
+        """Get an active LLM pod from the queue system - NO FALLBACKS"""
+        from api.services.ai.runpod.queues_service import compute_pod_signal, _get_active_pods_for_workflow
+        
+        await compute_pod_signal(LLM_WORKFLOW)
+        active_pods = await _get_active_pods_for_workflow(LLM_WORKFLOW)
+        pod_id = active_pods[0].get("id") if active_pods else None
+        if not pod_id:
+            raise RuntimeError(f"No active pods available for workflow '{LLM_WORKFLOW}'")
+        return pod_id
+    
+    async def _stream_llm_config(self, prompt: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Stream the LLM answer and return (raw text, config) as soon as the JSON object closes"""
+        
+        pod_id = await self._resolve_llm_pod()
+        buf = bytearray()
+        body_start = None
+        try:
+            async with aclosing(stream_prompt(prompt, pod_id=pod_id)) as stream:
+                async for chunk in stream:
+                    data = chunk.encode("utf-8")
+                    buf += data
+                    if body_start is None:
+                        stripped = buf.lstrip()
+                        if len(stripped) < 7:
+                            continue
+                        offset = len(buf) - len(stripped)
+                        if stripped[:7] == b"```json":
+                            body_start = offset + 7
+                        elif stripped[:3] == b"```":
+                            body_start = offset + 3
+                        else:
+                            body_start = offset
+                    if b"}" not in data:
+                        continue
+                    try:
+                        config = _json_loads(buf[body_start:])
+                    except ValueError:
+                        continue
+                    if isinstance(config, dict):
+                        return buf.decode("utf-8", errors="replace"), config
+        except Exception as e:
+            logger.warning(
+                f"Streaming LLM call failed after {len(buf)} bytes, falling back to a full response: {e}"
+            )
+            return await generate_prompt(prompt, pod_id=pod_id), None
+        
+        return buf.decode("utf-8", errors="replace"), None
+    
+    def _apply_config_defaults(
+        self, config: Dict[str, Any], input_tracks: int, input_images: int
+    ) -> Dict[str, Any]:
+        """Fill in defaults for fields the LLM left out"""
+        
+        defaults = {
+            "project_type": "music_video_clip" if input_tracks > 0 else "video_clip",
+            "visual_style": "cinematic",
+            "duration": 30,
+            "prompt_user_input": "",
+            "reference_images": input_images
+        }
+        
+        for key, default_value in defaults.items():
+            if key not in config or config[key] is None:
+                config[key] = default_value
+        
+        if config.get("project_type") == "music_video_clip" and not config.get("video_type"):
+            config["video_type"] = "recurring-scenes"
+        
+        return config
+    
+    def _parse_llm_response_checked(
+        self, response: str, input_tracks: int, input_images: int
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Parse LLM response; the flag is False when the fallback config was used"""
+        
+        try:
+            cleaned_response = _FENCE_RE.sub("", response).strip()
             
-            for key, default_value in defaults.items():
-                if key not in config or config[key] is None:
-                    config[key] = default_value
-            
-            if config.get("project_type") == "music_video_clip" and not config.get("video_type"):
-                config["video_type"] = "recurring-scenes"
+            config = _json_loads(cleaned_response)
             
-            return config
+            return self._apply_config_defaults(config, input_tracks, input_images), True
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {str(e)}")
@@ -242,7 +447,7 @@ class ChatbotService:
                 "duration": 30,
                 "prompt_user_input": response[:500] if response else "",
                 "reference_images": input_images
-            }
+            }, False
     
     def _update_config_from_response(
         self,
@@ -268,52 +473,30 @@ class ChatbotService:
             logger.error(f"Error updating config: {str(e)}")
             return current_config
     
-    def _check_if_clarification_needed(self, config: Dict[str, Any]) -> bool:
-        """Check if clarification is needed based on missing fields"""
-        
-        project_type = config.get("project_type")
-        
-        if not project_type:
-            return True
+    def _evaluate_config(self, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """Return whether clarification is needed and the prompts for missing fields"""
         
-        if project_type == "music_video_clip" and not config.get("video_type"):
-            return True
-        
-        if not config.get("visual_style"):
-            return True
+        missing = self._get_missing_fields(config)
+        return bool(missing), missing
+    
+    def _missing_keys(self, config: Dict[str, Any]) -> Iterator[str]:
+        """Yield the required fields that are still empty in config"""
         
-        if not config.get("duration"):
-            return True
+        required = _REQUIRED_FIELDS.get(config.get("project_type"), _DEFAULT_REQUIRED_FIELDS)
+        return (field for field in required if not config.get(field))
+    
+    def _check_if_clarification_needed(self, config: Dict[str, Any]) -> bool:
+        """Check if clarification is needed based on missing fields"""
         
-        return False
+        return next(self._missing_keys(config), None) is not None
     
     def _get_missing_fields(self, config: Dict[str, Any]) -> List[str]:
         """Get list of missing field prompts"""
         
-        missing = []
-        
-        project_type = config.get("project_type")
-        if not project_type:
-            missing.append("What type of project would you like to create? (music video, video clip, business ad, etc.)")
-        
-        if project_type == "music_video_clip" and not config.get("video_type"):
-            missing.append("What type of video would you like? (static, animated, or scene-based)")
-        
-        if not config.get("visual_style"):
-            missing.append("What visual style are you looking for? (e.g., cinematic, abstract, vibrant, minimal)")
-        
-        if not config.get("duration"):
-            missing.append("What duration would you like for your video? (in seconds)")
-        
-        return missing
-
-_chatbot_service = None
+        return [_MISSING_PROMPT[key] for key in self._missing_keys(config)]
 
+@lru_cache(maxsize=1)
 def get_chatbot_service() -> ChatbotService:
     """Get singleton chatbot service instance"""
-    
-    global _chatbot_service
-    if _chatbot_service is None:
-        _chatbot_service = ChatbotService()
-    return _chatbot_service
+    return ChatbotService()
 
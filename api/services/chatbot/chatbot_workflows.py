@@ -1,11 +1,123 @@
-from typing import Dict, Any, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Pipeline definitions for each project type, built once at import and read-only
+_PIPELINES: Mapping[str, Tuple[Mapping[str, Any], ...]] = _freeze({
+    "music_video_clip": [
+        {
+            "id": "looped-static",
+            "name": "Looped Static",
+            "description": "Static image with looping animation",
+            "video_type": "looped-static",
+            "required_fields": [
+                "prompt_user_input",
+                "visual_style",
+                "duration"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "video_style",
+                "animation_style"
+            ]
+        },
+        {
+            "id": "looped-animated",
+            "name": "Looped Animated",
+            "description": "Animated looping video",
+            "video_type": "looped-animated",
+            "required_fields": [
+                "prompt_user_input",
+                "visual_style",
+                "duration"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "animation_style",
+                "video_style"
+            ]
+        },
+        {
+            "id": "recurring-scenes",
+            "name": "Recurring Scenes",
+            "description": "Multiple scenes that transition smoothly",
+            "video_type": "recurring-scenes",
+            "required_fields": [
+                "prompt_user_input",
+                "visual_style",
+                "duration",
+                "number_of_scenes"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "video_transition",
+                "audio_transition"
+            ]
+        }
+    ],
+    "video_clip": [
+        {
+            "id": "standard-video",
+            "name": "Standard Video",
+            "description": "Standard video generation pipeline",
+            "required_fields": [
+                "prompt_user_input",
+                "visual_style",
+                "duration"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "video_format"
+            ]
+        }
+    ],
+    "business_ad": [
+        {
+            "id": "business-ad-standard",
+            "name": "Business Ad Standard",
+            "description": "Standard business advertisement pipeline",
+            "required_fields": [
+                "prompt_user_input",
+                "visual_style",
+                "duration"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "brand_colors",
+                "logo"
+            ]
+        }
+    ],
+    "automate_workflow": [
+        {
+            "id": "automation-standard",
+            "name": "Automation Workflow",
+            "description": "Automated workflow pipeline",
+            "required_fields": [
+                "prompt_user_input",
+                "workflow_type"
+            ],
+            "optional_fields": [
+                "reference_images",
+                "automation_params"
+            ]
+        }
+    ]
+})
+
 
 class ChatbotWorkflows:
     """Service for getting available pipelines for project types"""
     
-    def __init__(self):
-        self.pipelines = self._initialize_pipelines()
-    
     def get_pipelines_for_project_type(self, project_type: str) -> Dict[str, Any]:
         """Get available pipelines for a project type"""
         
@@ -17,7 +129,7 @@ class ChatbotWorkflows:
                     "pipelines": []
                 }
             
-            project_pipelines = self.pipelines.get(project_type, [])
+            project_pipelines = _PIPELINES.get(project_type, ())
             
             if not project_pipelines:
                 return {
@@ -38,119 +150,9 @@ class ChatbotWorkflows:
                 "error": str(e),
                 "pipelines": []
             }
-    
-    def _initialize_pipelines(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Initialize pipeline definitions for each project type"""
-        
-        return {
-            "music_video_clip": [
-                {
-                    "id": "looped-static",
-                    "name": "Looped Static",
-                    "description": "Static image with looping animation",
-                    "video_type": "looped-static",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "visual_style",
-                        "duration"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "video_style",
-                        "animation_style"
-                    ]
-                },
-                {
-                    "id": "looped-animated",
-                    "name": "Looped Animated",
-                    "description": "Animated looping video",
-                    "video_type": "looped-animated",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "visual_style",
-                        "duration"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "animation_style",
-                        "video_style"
-                    ]
-                },
-                {
-                    "id": "recurring-scenes",
-                    "name": "Recurring Scenes",
-                    "description": "Multiple scenes that transition smoothly",
-                    "video_type": "recurring-scenes",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "visual_style",
-                        "duration",
-                        "number_of_scenes"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "video_transition",
-                        "audio_transition"
-                    ]
-                }
-            ],
-            "video_clip": [
-                {
-                    "id": "standard-video",
-                    "name": "Standard Video",
-                    "description": "Standard video generation pipeline",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "visual_style",
-                        "duration"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "video_format"
-                    ]
-                }
-            ],
-            "business_ad": [
-                {
-                    "id": "business-ad-standard",
-                    "name": "Business Ad Standard",
-                    "description": "Standard business advertisement pipeline",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "visual_style",
-                        "duration"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "brand_colors",
-                        "logo"
-                    ]
-                }
-            ],
-            "automate_workflow": [
-                {
-                    "id": "automation-standard",
-                    "name": "Automation Workflow",
-                    "description": "Automated workflow pipeline",
-                    "required_fields": [
-                        "prompt_user_input",
-                        "workflow_type"
-                    ],
-                    "optional_fields": [
-                        "reference_images",
-                        "automation_params"
-                    ]
-                }
-            ]
-        }
-
-_chatbot_workflows = None
 
+@lru_cache(maxsize=1)
 def get_chatbot_workflows() -> ChatbotWorkflows:
     """Get singleton chatbot workflows instance"""
-    
-    global _chatbot_workflows
-    if _chatbot_workflows is None:
-        _chatbot_workflows = ChatbotWorkflows()
-    return _chatbot_workflows
+    return ChatbotWorkflows()
 
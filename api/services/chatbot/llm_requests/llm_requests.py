@@ -1,16 +1,47 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import string
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 from api.services.ai.llm_service import generate_prompt
-from api.services.ai.llm_queue_service import get_llm_queue_client
-from api.services.storage.backend_storage import backend_storage_service
+from api.services.chatbot.llm_requests.prompt_batcher import PromptBatcher
 
 logger = logging.getLogger(__name__)
 
 LLM_CONFIGS_DIR = Path(__file__).parent
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL", "86400"))
+WORKFLOWS_CACHE_TTL_SECONDS = 5.0
+
+_FORMATTER = string.Formatter()
+
+
+class _DefaultDict(dict):
+    """Format mapping that renders missing template fields as empty strings"""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _template_fields(template: str) -> frozenset:
+    return frozenset(field for _, field, _, _ in _FORMATTER.parse(template) if field)
 
 
 class LLMRequestHandler:
@@ -20,61 +51,110 @@ class LLMRequestHandler:
     """
     
     def __init__(self):
-        self.config_cache: Dict[str, Dict[str, Any]] = {}
+        # workflow name -> (config file mtime_ns, parsed config)
+        self.config_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        # (workflow, prompt) -> template field names, kept out of the public config
+        self._field_names: Dict[Tuple[str, str], frozenset] = {}
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._sem = asyncio.Semaphore(int(os.getenv("LLM_CONCURRENCY", "6")))
+        self._batcher = PromptBatcher(
+            self._dispatch_batch,
+            max_batch=int(os.getenv("LLM_BATCH_MAX", "16")),
+            max_wait_ms=int(os.getenv("LLM_BATCH_WAIT_MS", "25")),
+        )
+        self._disk_cache = self._open_disk_cache()
+        self._workflows_cache: Optional[Tuple[float, List[str]]] = None
+        self.warm_cache()
+    
+    def _open_disk_cache(self):
+        """
+        OPEN THE OPT-IN ON-DISK RESPONSE CACHE (LLM_DISK_CACHE=true)
+        """
+        if os.getenv("LLM_DISK_CACHE", "false").lower() != "true":
+            return None
+        if diskcache is None:
+            logger.warning("LLM_DISK_CACHE is enabled but diskcache is not installed; responses will not be cached")
+            return None
+        return diskcache.Cache(os.getenv("LLM_CACHE_DIR", "/tmp/llm_cache"), size_limit=2**30)
+    
+    def warm_cache(self) -> None:
+        """
+        LOAD EVERY AVAILABLE WORKFLOW CONFIGURATION INTO THE CACHE
+        """
+        for workflow_name in self.get_available_workflows():
+            try:
+                self._load_workflow_config(workflow_name)
+            except Exception as e:
+                logger.error(f"Failed to preload workflow configuration {workflow_name}: {e}")
     
     def _load_workflow_config(self, workflow_name: str) -> Dict[str, Any]:
         """
         LOAD WORKFLOW CONFIGURATION FROM JSON FILE
+        Cached per workflow and reloaded when the file's mtime changes
         """
-        if workflow_name in self.config_cache:
-            return self.config_cache[workflow_name]
-        
         config_file = LLM_CONFIGS_DIR / f"{workflow_name}-llm.json"
         
-        if not config_file.exists():
+        try:
+            mtime_ns = os.stat(config_file).st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Workflow configuration not found: {config_file}")
         
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+        cached = self.config_cache.get(workflow_name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with self._locks[workflow_name]:
+            cached = self.config_cache.get(workflow_name)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
             
-            self.config_cache[workflow_name] = config
+            try:
+                raw = config_file.read_bytes()
+                config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            except ValueError as e:
+                # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+                raise ValueError(f"Invalid JSON in workflow configuration {config_file}: {e}")
+            except Exception as e:
+                raise RuntimeError(f"Failed to load workflow configuration {config_file}: {e}")
+            
+            for key in [key for key in self._field_names if key[0] == workflow_name]:
+                del self._field_names[key]
+            for prompt_name, prompt_config in config.get("prompts", {}).items():
+                template = prompt_config.get("template")
+                if not template:
+                    continue
+                try:
+                    self._field_names[(workflow_name, prompt_name)] = _template_fields(template)
+                except ValueError as e:
+                    # Left unindexed; formatting this prompt will raise with the details
+                    logger.warning(f"Invalid prompt template {workflow_name}.{prompt_name} in {config_file}: {e}")
+            
+            self.config_cache[workflow_name] = (mtime_ns, config)
             logger.info(f"Loaded workflow configuration: {workflow_name}")
             return config
-            
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in workflow configuration {config_file}: {e}")
-        except Exception as e:
-            raise RuntimeError(f"Failed to load workflow configuration {config_file}: {e}")
     
     def _format_prompt(
         self,
         prompt_template: str,
         arguments: Dict[str, Any],
-        optional_arguments: Optional[Dict[str, Any]] = None
+        optional_arguments: Optional[Dict[str, Any]] = None,
+        field_names: Optional[frozenset] = None
     ) -> str:
         """
         FORMAT PROMPT TEMPLATE WITH PROVIDED ARGUMENTS
         Handles missing optional arguments by using empty strings
         """
-        all_args = {**arguments}
+        all_args = _DefaultDict(arguments)
         if optional_arguments:
             all_args.update(optional_arguments)
         
-        try:
-            formatted_prompt = prompt_template.format(**all_args)
-            return formatted_prompt
-        except KeyError as e:
-            missing_key = str(e).strip("'\"")
-            logger.warning(f"Missing argument '{missing_key}' in prompt template, using empty string")
-            all_args[missing_key] = ""
-            try:
-                return prompt_template.format(**all_args)
-            except KeyError:
-                import re
-                pattern = re.compile(r'\{(?:' + missing_key + r'[^}]*)\}')
-                formatted_prompt = pattern.sub('', prompt_template)
-                return formatted_prompt.strip()
+        if field_names is None:
+            field_names = _template_fields(prompt_template)
+        missing = field_names.difference(all_args)
+        if missing:
+            logger.warning(f"Missing arguments {sorted(missing)} in prompt template, using empty strings")
+        
+        return prompt_template.format_map(all_args)
     
     async def process_request(
         self,
@@ -127,14 +207,26 @@ class LLMRequestHandler:
             formatted_prompt = self._format_prompt(
                 prompt_template=prompt_template,
                 arguments=arguments,
-                optional_arguments=optional_arguments
+                optional_arguments=optional_arguments,
+                field_names=self._field_names.get((workflow, prompt))
             )
             
             logger.info(f"Processing LLM request: {workflow}.{prompt}")
             logger.debug(f"Formatted prompt: {formatted_prompt[:200]}...")
             
+            cache_key = None
+            if self._disk_cache is not None and not (image_base64 or image_file_path or image_s3_key):
+                cache_key = hashlib.sha256(f"{prompt_config.get('model')}|{formatted_prompt}".encode("utf-8")).hexdigest()
+                # diskcache does SQLite and file I/O; keep it off the event loop
+                cached = await asyncio.to_thread(self._disk_cache.get, cache_key)
+                if cached is not None:
+                    logger.info(f"LLM response for {workflow}.{prompt} served from disk cache")
+                    return cached
+            
             image_url = None
             if image_s3_key:
+                from api.services.storage.backend_storage import backend_storage_service
+                
                 try:
                     image_url = backend_storage_service.get_short_lived_image_url(image_s3_key)
                     logger.info(f"Generated short-lived image URL for S3 key: {image_s3_key}")
@@ -144,14 +236,23 @@ class LLMRequestHandler:
             
             if use_queue:
                 logger.info(f"Using queue system for LLM request: {workflow}.{prompt}")
-                queue_client = get_llm_queue_client()
-                response = await queue_client.execute(
-                    prompt=formatted_prompt,
-                    model=prompt_config.get("model"),
-                    image_url=image_url,
-                    image_base64=image_base64,
-                    timeout_seconds=prompt_config.get("timeout_seconds", 300)
-                )
+                if image_url or image_base64:
+                    from api.services.ai.llm_queue_service import get_llm_queue_client
+                    
+                    queue_client = get_llm_queue_client()
+                    response = await queue_client.execute(
+                        prompt=formatted_prompt,
+                        model=prompt_config.get("model"),
+                        image_url=image_url,
+                        image_base64=image_base64,
+                        timeout_seconds=prompt_config.get("timeout_seconds", 300)
+                    )
+                else:
+                    timeout_seconds = prompt_config.get("timeout_seconds", 300)
+                    batch_key = (workflow, prompt, prompt_config.get("model"), timeout_seconds)
+                    fut = asyncio.get_running_loop().create_future()
+                    await self._batcher.submit(batch_key, formatted_prompt, fut)
+                    response = await asyncio.wait_for(fut, timeout_seconds)
             else:
                 logger.info(f"Using direct LLM call for: {workflow}.{prompt}")
                 response = await generate_prompt(
@@ -163,21 +264,56 @@ class LLMRequestHandler:
                     timeout_seconds=prompt_config.get("timeout_seconds", 300)
                 )
             
+            if cache_key is not None:
+                await asyncio.to_thread(self._disk_cache.set, cache_key, response, expire=LLM_CACHE_TTL_SECONDS)
+            
             return response
             
         except Exception as e:
             logger.error(f"Failed to process LLM request {workflow}.{prompt}: {e}")
             raise
     
+    async def _dispatch_batch(self, key: Tuple[str, str, Optional[str], int], prompts: List[str]) -> List[Union[str, BaseException]]:
+        from api.services.ai.llm_queue_service import get_llm_queue_client
+        
+        _, _, model, timeout_seconds = key
+        queue_client = get_llm_queue_client()
+        return await queue_client.execute_batch(prompts, model=model, timeout_seconds=timeout_seconds)
+    
+    async def _bounded(self, item: Dict[str, Any]) -> str:
+        async with self._sem:
+            # Bad keyword arguments surface here, as this item's result
+            return await self.process_request(**item)
+    
+    async def process_requests_batch(self, items: List[Dict[str, Any]]) -> List[Union[str, BaseException]]:
+        """
+        PROCESS SEVERAL INDEPENDENT LLM REQUESTS CONCURRENTLY
+        
+        Args:
+            items: Keyword arguments for process_request, one dict per request
+            
+        Returns:
+            Response text or the raised exception for each item, in input order
+            (at most LLM_CONCURRENCY requests are in flight at once)
+        """
+        return await asyncio.gather(*(self._bounded(item) for item in items), return_exceptions=True)
+    
     def get_available_workflows(self) -> List[str]:
         """
         GET LIST OF AVAILABLE WORKFLOW CONFIGURATIONS
         """
-        workflows = []
-        for file in LLM_CONFIGS_DIR.glob("*-llm.json"):
-            workflow_name = file.stem.replace("-llm", "")
-            workflows.append(workflow_name)
-        return workflows
+        now = time.monotonic()
+        if self._workflows_cache is not None and now - self._workflows_cache[0] < WORKFLOWS_CACHE_TTL_SECONDS:
+            return list(self._workflows_cache[1])
+        
+        with os.scandir(LLM_CONFIGS_DIR) as entries:
+            workflows = [
+                entry.name[:-len("-llm.json")]
+                for entry in entries
+                if entry.name.endswith("-llm.json") and entry.is_file()
+            ]
+        self._workflows_cache = (now, workflows)
+        return list(workflows)
     
     def get_workflow_prompts(self, workflow: str) -> List[str]:
         """
@@ -192,15 +328,10 @@ class LLMRequestHandler:
             return []
 
 
-_llm_request_handler = None
-
-
+@lru_cache(maxsize=1)
 def get_llm_request_handler() -> LLMRequestHandler:
     """
     GET SINGLETON LLM REQUEST HANDLER INSTANCE
     """
-    global _llm_request_handler
-    if _llm_request_handler is None:
-        _llm_request_handler = LLMRequestHandler()
-    return _llm_request_handler
+    return LLMRequestHandler()
 
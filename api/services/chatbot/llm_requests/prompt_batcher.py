@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+BatchDispatcher = Callable[[Hashable, List[str]], Awaitable[List[Union[str, BaseException]]]]
+
+
+class PromptBatcher:
+    """
+    COALESCES NEAR-SIMULTANEOUS PROMPTS INTO BATCHED LLM CALLS
+    A background task drains the submission queue into windows of up to max_batch
+    items or max_wait_ms, groups them by key (items with the same key share
+    decoding settings) and hands each group to the dispatcher in one call.
+    """
+
+    def __init__(self, dispatch: BatchDispatcher, max_batch: int = 16, max_wait_ms: int = 25):
+        self._dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # The loop only keeps weak references to tasks; hold in-flight flushes here
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    def _ensure_running(self) -> None:
+        # The drain task and queue belong to one loop; start fresh ones when called from another
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            if self._queue is not None:
+                self._abandon_on(self._loop, self._task, self._queue)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    def _abandon_on(
+        self, loop: Optional[asyncio.AbstractEventLoop], task: Optional[asyncio.Task], queue: asyncio.Queue
+    ) -> None:
+        """Stop an old drain task and fail whatever was still queued for it, on its own loop"""
+        if loop is asyncio.get_running_loop():
+            self._abandon(task, queue)
+        elif loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._abandon, task, queue)
+
+    @staticmethod
+    def _abandon(task: Optional[asyncio.Task], queue: asyncio.Queue) -> None:
+        if task is not None:
+            task.cancel()
+        while not queue.empty():
+            _, _, fut = queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("LLM batcher restarted before this prompt was dispatched"))
+
+    async def submit(self, key: Hashable, prompt: str, fut: asyncio.Future) -> None:
+        """
+        Queue a prompt; fut receives its response text or exception
+        """
+        self._ensure_running()
+        await self._queue.put((key, prompt, fut))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[Hashable, List[Tuple[str, asyncio.Future]]] = defaultdict(list)
+            for key, prompt, fut in batch:
+                groups[key].append((prompt, fut))
+            for key, items in groups.items():
+                task = loop.create_task(self._flush(key, items))
+                self._flush_tasks.add(task)
+                task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, key: Hashable, items: List[Tuple[str, asyncio.Future]]) -> None:
+        logger.debug(f"Dispatching LLM batch of {len(items)} for {key}")
+        try:
+            results: List[Any] = await self._dispatch(key, [prompt for prompt, _ in items])
+        except Exception as e:
+            results = [e] * len(items)
+
+        if len(results) < len(items):
+            missing = RuntimeError(f"LLM batch returned {len(results)} results for {len(items)} prompts")
+            results = list(results) + [missing] * (len(items) - len(results))
+
+        for (_, fut), result in zip(items, results):
+            if fut.done():
+                continue
+            if isinstance(result, BaseException):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
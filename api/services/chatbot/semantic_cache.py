@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = os.getenv("CHATBOT_CACHE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SIMILARITY_THRESHOLD = float(os.getenv("CHATBOT_CACHE_SIMILARITY", "0.92"))
+REDIS_TTL_SECONDS = 900
+EMBEDDING_GROW_ROWS = 64
+QUANT_SCALE = 127
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _quantize(embedding):
+    """Map an L2-normalized float vector onto int8 in [-127, 127]"""
+    return np.clip(np.rint(embedding * QUANT_SCALE), -QUANT_SCALE, QUANT_SCALE).astype(np.int8)
+
+
+class SemanticCache:
+    """
+    LRU cache of analyzed chatbot configs keyed on the user request.
+
+    Lookups try an exact match on the normalized prompt first (in-process, then
+    Redis when enabled); callers embed the request only on a miss and fall back
+    to get_similar, which compares sentence embeddings when sentence-transformers
+    is installed. Entries only match
+    requests with the same (input_tracks, input_images, tier) context.
+    """
+
+    def __init__(self, max_entries: int = 1024, use_redis: bool = False):
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._embedder = None
+        self._embedder_failed = False
+        # Embeddings live in one preallocated int8 matrix; each cached key owns a row
+        self._emb_matrix = None
+        self._row_context = None
+        self._row_keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._context_ids: Dict[Tuple[int, int, str], int] = {}
+
+    @staticmethod
+    def make_key(user_input: str, input_tracks: int, input_images: int, tier: str) -> str:
+        digest = hashlib.sha1(_normalize(user_input).encode("utf-8")).hexdigest()
+        return f"{tier}:{input_tracks}:{input_images}:{digest}"
+
+    def _get_embedder(self):
+        if self._embedder is None and not self._embedder_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                self._embedder = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            except Exception as e:
+                logger.info(f"Semantic cache running in exact-match mode: {e}")
+                self._embedder_failed = True
+        return self._embedder
+
+    def embed(self, text: str):
+        """Return the L2-normalized float32 embedding of text, or None when unavailable"""
+        embedder = self._get_embedder()
+        if embedder is None or np is None:
+            return None
+        vector = np.asarray(embedder.encode(_normalize(text)), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    async def _redis(self):
+        if not self.use_redis:
+            return None
+        try:
+            from api.services.cache.redis_cache import get_cache_service
+
+            service = await get_cache_service()
+            return service if service._connected else None
+        except Exception as e:
+            logger.warning(f"Redis unavailable for chatbot cache, using in-process cache only: {e}")
+            self.use_redis = False
+            return None
+
+    async def get(self, key: str, context: Tuple[int, int, str]) -> Optional[Dict[str, Any]]:
+        """Exact-match lookup on the normalized prompt (in-process, then Redis)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry["config"]
+
+        redis_service = await self._redis()
+        if redis_service is not None:
+            config = await redis_service.get(f"memory:{key}")
+            if config is not None:
+                self._store(key, context, config, None)
+                return config
+        return None
+
+    def get_similar(self, context: Tuple[int, int, str], embedding) -> Optional[Dict[str, Any]]:
+        """Nearest cached config for the same context, if above the similarity threshold"""
+        context_id = self._context_ids.get(context)
+        if embedding is None or context_id is None or not self._rows:
+            return None
+        n = len(self._row_keys)
+        sims = np.matmul(self._emb_matrix[:n], _quantize(embedding), dtype=np.int32)
+        sims[self._row_context[:n] != context_id] = np.iinfo(np.int32).min
+        best = int(sims.argmax())
+        if sims[best] < SIMILARITY_THRESHOLD * QUANT_SCALE * QUANT_SCALE:
+            return None
+        best_key = self._row_keys[best]
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key]["config"]
+
+    async def set(self, key: str, context: Tuple[int, int, str], config: Dict[str, Any], embedding=None) -> None:
+        self._store(key, context, config, embedding)
+        redis_service = await self._redis()
+        if redis_service is not None:
+            await redis_service.set(f"memory:{key}", config, ttl=REDIS_TTL_SECONDS)
+
+    def _store(self, key: str, context: Tuple[int, int, str], config: Dict[str, Any], embedding) -> None:
+        self._entries[key] = {"context": context, "config": config}
+        self._entries.move_to_end(key)
+        if embedding is not None and np is not None:
+            self._index(key, context, embedding)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._unindex(evicted_key)
+
+    def _index(self, key: str, context: Tuple[int, int, str], embedding) -> None:
+        row = self._rows.get(key)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._row_keys)
+                self._row_keys.append(None)
+                if self._emb_matrix is None or row >= len(self._emb_matrix):
+                    self._grow(embedding.shape[0])
+            self._rows[key] = row
+        context_id = self._context_ids.setdefault(context, len(self._context_ids))
+        self._emb_matrix[row] = _quantize(embedding)
+        self._row_context[row] = context_id
+        self._row_keys[row] = key
+
+    def _unindex(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._row_context[row] = -1
+            self._row_keys[row] = None
+            self._free_rows.append(row)
+
+    def _grow(self, dim: int) -> None:
+        rows = np.zeros((EMBEDDING_GROW_ROWS, dim), dtype=np.int8)
+        contexts = np.full(EMBEDDING_GROW_ROWS, -1, dtype=np.int32)
+        if self._emb_matrix is None:
+            self._emb_matrix, self._row_context = rows, contexts
+        else:
+            self._emb_matrix = np.concatenate((self._emb_matrix, rows))
+            self._row_context = np.concatenate((self._row_context, contexts))
@@ -1,7 +1,10 @@
 import asyncio
 import base64
+import json
 import logging
-from typing import Any, Dict, Optional
+import random
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import httpx
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
@@ -11,8 +14,39 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:
+    h2 = None
+
 logger = logging.getLogger(__name__)
 
+# 2Captcha result polling: exponential backoff with jitter
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 8.0
+POLL_BACKOFF = 1.5
+POLL_JITTER = 0.5
+
+# Quick retries for 2Captcha 5xx responses within a single poll
+SERVER_ERROR_RETRIES = 3
+SERVER_ERROR_INITIAL_DELAY = 0.2
+SERVER_ERROR_MAX_DELAY = 2.0
+
+# hCaptcha site key embedded in page HTML (data-sitekey attribute or iframe URL)
+SITEKEY_RE = re.compile(rb"""(?:data-sitekey|sitekey=)["']?([0-9a-f-]{36})""", re.I)
+
+# 2Captcha responses are parsed straight from bytes
+_loads = orjson.loads if orjson else json.loads
+
+
+def _poll_delay(attempt: int) -> float:
+    return min(POLL_MAX_DELAY, POLL_INITIAL_DELAY * POLL_BACKOFF**attempt) + random.uniform(0, POLL_JITTER)
+
 
 class SunoCaptchaSolver:
     """CAPTCHA solver for Suno API using 2Captcha service"""
@@ -20,6 +54,35 @@ class SunoCaptchaSolver:
     def __init__(self, twocaptcha_key: str):
         self.twocaptcha_key = twocaptcha_key
         self.base_url = "https://2captcha.com"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "SunoCaptchaSolver":
+        self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled 2Captcha client (HTTP/2 when h2 is installed), creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(10.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=h2 is not None,
+                    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                    retries=3,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled 2Captcha client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def solve_hcaptcha(self, site_key: str, page_url: str) -> Optional[str]:
         """
@@ -46,6 +109,21 @@ class SunoCaptchaSolver:
             logger.error(f"Error solving hCaptcha: {e}")
             return None
 
+    async def solve_hcaptcha_batch(self, jobs: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Solve several hCaptchas concurrently
+
+        Args:
+            jobs: (site_key, page_url) pairs
+
+        Returns:
+            CAPTCHA token or None for each job, in input order
+        """
+        captcha_ids = await asyncio.gather(*(self._submit_captcha(site_key, page_url) for site_key, page_url in jobs))
+        pending = [captcha_id for captcha_id in captcha_ids if captcha_id]
+        solutions = iter(await asyncio.gather(*(self._wait_for_solution(captcha_id) for captcha_id in pending)))
+        return [next(solutions) if captcha_id else None for captcha_id in captcha_ids]
+
     async def solve_image_captcha(self, image_data: bytes, instructions: str = None) -> Optional[Dict[str, Any]]:
         """
         Solve image-based CAPTCHA using 2Captcha service
@@ -86,19 +164,19 @@ class SunoCaptchaSolver:
                 "useragent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(f"{self.base_url}/in.php", data=data)
+            client = self._get_client()
+            response = await client.post("/in.php", data=data)
 
-                if response.status_code != 200:
-                    logger.error(f"Failed to submit CAPTCHA: {response.status_code}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Failed to submit CAPTCHA: {response.status_code}")
+                return None
 
-                result = response.json()
-                if result.get("status") == 1:
-                    return result.get("request")
-                else:
-                    logger.error(f"CAPTCHA submission failed: {result.get('error_text')}")
-                    return None
+            result = _loads(response.content)
+            if result.get("status") == 1:
+                return result.get("request")
+            else:
+                logger.error(f"CAPTCHA submission failed: {result.get('error_text')}")
+                return None
 
         except Exception as e:
             logger.error(f"Error submitting CAPTCHA: {e}")
@@ -112,19 +190,19 @@ class SunoCaptchaSolver:
             if instructions:
                 data["textinstructions"] = instructions
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(f"{self.base_url}/in.php", data=data)
+            client = self._get_client()
+            response = await client.post("/in.php", data=data)
 
-                if response.status_code != 200:
-                    logger.error(f"Failed to submit image CAPTCHA: {response.status_code}")
-                    return None
+            if response.status_code != 200:
+                logger.error(f"Failed to submit image CAPTCHA: {response.status_code}")
+                return None
 
-                result = response.json()
-                if result.get("status") == 1:
-                    return result.get("request")
-                else:
-                    logger.error(f"Image CAPTCHA submission failed: {result.get('error_text')}")
-                    return None
+            result = _loads(response.content)
+            if result.get("status") == 1:
+                return result.get("request")
+            else:
+                logger.error(f"Image CAPTCHA submission failed: {result.get('error_text')}")
+                return None
 
         except Exception as e:
             logger.error(f"Error submitting image CAPTCHA: {e}")
@@ -132,82 +210,87 @@ class SunoCaptchaSolver:
 
     async def _wait_for_solution(self, captcha_id: str, timeout: int = 120) -> Optional[str]:
         """Wait for CAPTCHA solution from 2Captcha"""
-        try:
-            start_time = asyncio.get_event_loop().time()
-
-            while (asyncio.get_event_loop().time() - start_time) < timeout:
-                await asyncio.sleep(5)  # Wait 5 seconds between checks
-
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/res.php",
-                        params={"key": self.twocaptcha_key, "action": "get", "id": captcha_id, "json": 1},
-                    )
-
-                    if response.status_code != 200:
-                        continue
-
-                    result = response.json()
-                    if result.get("status") == 1:
-                        return result.get("request")
-                    elif result.get("error_text") == "CAPCHA_NOT_READY":
-                        continue
-                    else:
-                        logger.error(f"CAPTCHA solution failed: {result.get('error_text')}")
-                        return None
-
-            logger.error(f"CAPTCHA solution timeout after {timeout} seconds")
-            return None
-
-        except Exception as e:
-            logger.error(f"Error waiting for CAPTCHA solution: {e}")
-            return None
+        return await self._poll_result(captcha_id, timeout, lambda solution: solution, "CAPTCHA")
 
     async def _wait_for_image_solution(self, captcha_id: str, timeout: int = 120) -> Optional[Dict[str, Any]]:
         """Wait for image CAPTCHA solution from 2Captcha"""
+        return await self._poll_result(
+            captcha_id, timeout, lambda solution: {"text": solution or ""}, "Image CAPTCHA"
+        )
+
+    async def _get_retrying_5xx(self, url: str, **kwargs) -> httpx.Response:
+        """GET that quickly retries 5xx responses; connection errors are retried by the transport"""
+        response = await self._get_client().get(url, **kwargs)
+        for attempt in range(SERVER_ERROR_RETRIES):
+            if response.status_code < 500:
+                break
+            await asyncio.sleep(min(SERVER_ERROR_MAX_DELAY, SERVER_ERROR_INITIAL_DELAY * 2**attempt))
+            response = await self._get_client().get(url, **kwargs)
+        return response
+
+    async def _poll_result(
+        self, captcha_id: str, timeout: int, parser: Callable[[Optional[str]], Any], label: str
+    ) -> Optional[Any]:
+        """Poll res.php until the CAPTCHA is solved, fails or times out, and parse the solution"""
         try:
-            start_time = asyncio.get_event_loop().time()
-
-            while (asyncio.get_event_loop().time() - start_time) < timeout:
-                await asyncio.sleep(5)  # Wait 5 seconds between checks
-
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.base_url}/res.php",
-                        params={"key": self.twocaptcha_key, "action": "get", "id": captcha_id, "json": 1},
-                    )
-
-                    if response.status_code != 200:
-                        continue
-
-                    result = response.json()
-                    if result.get("status") == 1:
-                        # Parse solution for image CAPTCHA
-                        solution_text = result.get("request", "")
-                        return {"text": solution_text}
-                    elif result.get("error_text") == "CAPCHA_NOT_READY":
-                        continue
-                    else:
-                        logger.error(f"Image CAPTCHA solution failed: {result.get('error_text')}")
-                        return None
-
-            logger.error(f"Image CAPTCHA solution timeout after {timeout} seconds")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            attempt = 0
+
+            while (remaining := deadline - loop.time()) > 0:
+                delay = _poll_delay(attempt)
+                await asyncio.sleep(min(delay, remaining))
+                attempt += 1
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                response = await self._get_retrying_5xx(
+                    "/res.php",
+                    params={"key": self.twocaptcha_key, "action": "get", "id": captcha_id, "json": 1},
+                    timeout=min(delay + 2, remaining),
+                )
+
+                if response.status_code != 200:
+                    continue
+
+                result = _loads(response.content)
+                if result.get("status") == 1:
+                    return parser(result.get("request"))
+                elif result.get("error_text") == "CAPCHA_NOT_READY":
+                    continue
+                else:
+                    logger.error(f"{label} solution failed: {result.get('error_text')}")
+                    return None
+
+            logger.error(f"{label} solution timeout after {timeout} seconds")
             return None
 
         except Exception as e:
-            logger.error(f"Error waiting for image CAPTCHA solution: {e}")
+            logger.error(f"Error waiting for {label} solution: {e}")
             return None
 
+    def schedule_report_bad_captcha(self, captcha_id: str) -> None:
+        """
+        Report a bad CAPTCHA solution in the background and return immediately
+
+        Delivery is best effort and at most once: failures are only logged.
+        Must be called from a running event loop.
+        """
+        task = asyncio.get_running_loop().create_task(self.report_bad_captcha(captcha_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def report_bad_captcha(self, captcha_id: str) -> bool:
         """Report a bad CAPTCHA solution"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/res.php",
-                    params={"key": self.twocaptcha_key, "action": "reportbad", "id": captcha_id},
-                )
+            client = self._get_client()
+            response = await client.get(
+                "/res.php",
+                params={"key": self.twocaptcha_key, "action": "reportbad", "id": captcha_id},
+            )
 
-                return response.status_code == 200
+            return response.status_code == 200
 
         except Exception as e:
             logger.error(f"Error reporting bad CAPTCHA: {e}")
@@ -216,85 +299,165 @@ class SunoCaptchaSolver:
     async def get_balance(self) -> Optional[float]:
         """Get 2Captcha account balance"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/res.php", params={"key": self.twocaptcha_key, "action": "getbalance", "json": 1}
-                )
+            client = self._get_client()
+            response = await client.get(
+                "/res.php", params={"key": self.twocaptcha_key, "action": "getbalance", "json": 1}
+            )
 
-                if response.status_code != 200:
-                    return None
+            if response.status_code != 200:
+                return None
 
-                result = response.json()
-                if result.get("status") == 1:
-                    return float(result.get("request", 0))
-                else:
-                    logger.error(f"Failed to get balance: {result.get('error_text')}")
-                    return None
+            result = _loads(response.content)
+            if result.get("status") == 1:
+                return float(result.get("request", 0))
+            else:
+                logger.error(f"Failed to get balance: {result.get('error_text')}")
+                return None
 
         except Exception as e:
             logger.error(f"Error getting balance: {e}")
             return None
 
 
+_solvers: Dict[str, SunoCaptchaSolver] = {}
+
+
+def get_solver(twocaptcha_key: str) -> SunoCaptchaSolver:
+    """Get the shared solver (and its connection pool) for a 2Captcha key"""
+    solver = _solvers.get(twocaptcha_key)
+    if solver is None:
+        solver = _solvers[twocaptcha_key] = SunoCaptchaSolver(twocaptcha_key)
+    return solver
+
+
+async def close_solvers() -> None:
+    """Close every shared solver's connection pool and the shared browser (call on shutdown)"""
+    global _browser_solver
+    solvers = list(_solvers.values())
+    _solvers.clear()
+    for solver in solvers:
+        await solver.aclose()
+    browser_solver, _browser_solver = _browser_solver, None
+    if browser_solver is not None:
+        await browser_solver.shutdown()
+
+
 class SunoBrowserCaptchaSolver:
     """Browser-based CAPTCHA solver using Playwright or Selenium"""
 
+    _GET_SITEKEY_JS = """
+        () => {
+            const iframe = document.querySelector('iframe[title*="hCaptcha"]');
+            if (iframe) {
+                const match = iframe.src.match(/sitekey=([^&]+)/);
+                return match ? match[1] : null;
+            }
+            return null;
+        }
+    """
+    _SITEKEY_RE = re.compile(r"sitekey=([^&]+)")
+
     def __init__(self, headless: bool = True, locale: str = "en"):
         self.headless = headless
         self.locale = locale
+        self._pw = None
+        self._browser: Optional[Browser] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._startup_lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        """Launch the shared Chromium instance used by solve_with_playwright"""
+        if self._browser is not None:
+            return
+        async with self._startup_lock:
+            # Concurrent callers wait here instead of each launching a browser
+            if self._browser is None:
+                pw = await async_playwright().start()
+                try:
+                    self._browser = await pw.chromium.launch(headless=self.headless)
+                except BaseException:
+                    await pw.stop()
+                    raise
+                self._pw = pw
+
+    async def shutdown(self) -> None:
+        """Close the shared browser and HTTP client and stop Playwright"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def fetch_sitekey(self, page_url: str) -> Optional[str]:
+        """Read the hCaptcha site key straight from the page HTML, without a browser"""
+        try:
+            if self._http is None or self._http.is_closed:
+                self._http = httpx.AsyncClient(timeout=httpx.Timeout(10.0), follow_redirects=True)
+            response = await self._http.get(page_url)
+            match = SITEKEY_RE.search(response.content)
+            return match.group(1).decode() if match else None
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not fetch {page_url} for hCaptcha site key: {e}")
+            return None
+
+    async def _sitekey_from_browser(self, page_url: str) -> Optional[str]:
+        if self._browser is None:
+            await self.startup()
+        context = await self._browser.new_context(locale=self.locale)
+        page = await context.new_page()
+
+        try:
+            await page.goto(page_url)
+            await page.wait_for_load_state("networkidle")
+
+            # Wait for CAPTCHA to appear
+            await page.wait_for_selector('iframe[title*="hCaptcha"]', timeout=30000)
+
+            # Get CAPTCHA site key
+            return await page.evaluate(self._GET_SITEKEY_JS)
+
+        finally:
+            await context.close()
 
     async def solve_with_playwright(self, page_url: str) -> Optional[str]:
         """Solve CAPTCHA using Playwright browser automation"""
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=self.headless)
-                context = await browser.new_context(locale=self.locale)
-                page = await context.new_page()
+            # Most pages carry the site key in their initial HTML; only render when they don't
+            site_key = await self.fetch_sitekey(page_url)
+            if site_key is None:
+                site_key = await self._sitekey_from_browser(page_url)
 
-                try:
-                    await page.goto(page_url)
-                    await page.wait_for_load_state("networkidle")
-
-                    # Wait for CAPTCHA to appear
-                    await page.wait_for_selector('iframe[title*="hCaptcha"]', timeout=30000)
-
-                    # Get CAPTCHA site key
-                    site_key = await page.evaluate(
-                        """
-                        () => {
-                            const iframe = document.querySelector('iframe[title*="hCaptcha"]');
-                            if (iframe) {
-                                const src = iframe.src;
-                                const match = src.match(/sitekey=([^&]+)/);
-                                return match ? match[1] : null;
-                            }
-                            return null;
-                        }
-                    """
-                    )
-
-                    if not site_key:
-                        logger.error("Could not find hCaptcha site key")
-                        return None
-
-                    # Here you would implement the actual CAPTCHA solving logic
-                    # This is a simplified version - you'd need to implement
-                    # the full CAPTCHA solving workflow
-
-                    logger.info(f"Found hCaptcha with site key: {site_key}")
-
-                    # For now, return None as this is a placeholder
-                    return None
+            if not site_key:
+                logger.error("Could not find hCaptcha site key")
+                return None
 
-                finally:
-                    await browser.close()
+            # Here you would implement the actual CAPTCHA solving logic
+            # This is a simplified version - you'd need to implement
+            # the full CAPTCHA solving workflow
+
+            logger.info(f"Found hCaptcha with site key: {site_key}")
+
+            # For now, return None as this is a placeholder
+            return None
 
         except Exception as e:
             logger.error(f"Error solving CAPTCHA with Playwright: {e}")
             return None
 
-    def solve_with_selenium(self, page_url: str) -> Optional[str]:
-        """Solve CAPTCHA using Selenium browser automation"""
+    async def solve_with_selenium(self, page_url: str) -> Optional[str]:
+        """Solve CAPTCHA using Selenium browser automation on a worker thread"""
+        return await asyncio.to_thread(self._solve_with_selenium_sync, page_url)
+
+    def _solve_with_selenium_sync(self, page_url: str) -> Optional[str]:
+        """
+        Blocking Selenium implementation of solve_with_selenium
+
+        Waits up to 30s on the browser; never call it directly from async code.
+        """
         try:
             options = Options()
             if self.headless:
@@ -308,22 +471,13 @@ class SunoBrowserCaptchaSolver:
                 driver.get(page_url)
 
                 # Wait for CAPTCHA to appear
-                WebDriverWait(driver, 30).until(
+                iframe = WebDriverWait(driver, 30).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 'iframe[title*="hCaptcha"]'))
                 )
 
-                # Get CAPTCHA site key
-                site_key = driver.execute_script(
-                    """
-                    const iframe = document.querySelector('iframe[title*="hCaptcha"]');
-                    if (iframe) {
-                        const src = iframe.src;
-                        const match = src.match(/sitekey=([^&]+)/);
-                        return match ? match[1] : null;
-                    }
-                    return null;
-                """
-                )
+                # Get CAPTCHA site key from the iframe URL we already hold
+                match = self._SITEKEY_RE.search(iframe.get_attribute("src") or "")
+                site_key = match.group(1) if match else None
 
                 if not site_key:
                     logger.error("Could not find hCaptcha site key")
@@ -343,3 +497,14 @@ class SunoBrowserCaptchaSolver:
         except Exception as e:
             logger.error(f"Error solving CAPTCHA with Selenium: {e}")
             return None
+
+
+_browser_solver: Optional[SunoBrowserCaptchaSolver] = None
+
+
+def get_browser_solver() -> SunoBrowserCaptchaSolver:
+    """Get the shared browser solver; its browser starts lazily and is closed by close_solvers()"""
+    global _browser_solver
+    if _browser_solver is None:
+        _browser_solver = SunoBrowserCaptchaSolver()
+    return _browser_solver
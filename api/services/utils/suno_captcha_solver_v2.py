@@ -20,7 +20,7 @@ class SunoCaptchaSolver:
             logger.info(f"Solving hCaptcha for site_key: {site_key}")
 
             # Use the 2captcha Python package
-            result = self.solver.hcaptcha(sitekey=site_key, url=page_url)
+            result = await asyncio.to_thread(self.solver.hcaptcha, sitekey=site_key, url=page_url)
 
             if result and result.get("code"):
                 logger.info("hCaptcha solved successfully")
@@ -38,7 +38,7 @@ class SunoCaptchaSolver:
         try:
             logger.info(f"Solving reCAPTCHA v2 for site_key: {site_key}")
 
-            result = self.solver.recaptcha(sitekey=site_key, url=page_url)
+            result = await asyncio.to_thread(self.solver.recaptcha, sitekey=site_key, url=page_url)
 
             if result and result.get("code"):
                 logger.info("reCAPTCHA v2 solved successfully")
@@ -54,7 +54,7 @@ class SunoCaptchaSolver:
     async def get_balance(self) -> Optional[float]:
         """Get 2Captcha account balance"""
         try:
-            balance = self.solver.balance()
+            balance = await asyncio.to_thread(self.solver.balance)
             logger.info(f"2Captcha balance: ${balance}")
             return balance
         except Exception as e:
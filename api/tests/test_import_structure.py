@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script to verify import structure without full application initialization
+"""
+
+import ast
+import sys
+import os
+from functools import lru_cache
+from importlib import import_module
+from importlib.machinery import PathFinder
+from typing import Final
+
+import pytest
+
+# Add the project root (two levels above api/tests) to the Python path, once
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+SHARED_MODULE = "api.services.create.shared"
+
+_REQUIRED_FUNCTIONS: Final[frozenset[str]] = frozenset({
+    'create_video_generation_job',
+    'validate_step',
+    'regenerate_single_image',
+    'regenerate_single_video',
+    'validate_project_and_get_cost',
+    'create_generation_job',
+    'deduct_credits_and_update_status',
+    'handle_generation_failure',
+    'format_job_status',
+    'get_generation_progress',
+})
+
+_MSG_ALREADY_LOADED: Final = "✅ Shared module already loaded"
+_MSG_IMPORTED: Final = "✅ Shared module imported successfully"
+_MSG_PARSED: Final = "✅ Shared module source parsed successfully"
+_MSG_IMPORT_ERROR: Final = "❌ Import error:"
+_MSG_MISSING: Final = "❌ Missing functions:"
+_MSG_ALL_FOUND: Final = "✅ All required functions found in shared module"
+_MSG_SUCCESS: Final = (
+    "\n🎉 Import structure is correct! The missing functions have been added.\n"
+    "The segmentation fault is likely due to missing dependencies (jose, librosa),\n"
+    "not the import structure itself."
+)
+
+
+def _find_spec(name):
+    """Resolve a dotted module spec without running any parent package __init__"""
+    spec, search_path = None, sys.path
+    for part in name.split("."):
+        spec = PathFinder.find_spec(part, search_path)
+        if spec is None:
+            return None
+        search_path = spec.submodule_search_locations
+        if search_path is None:
+            break
+    return spec
+
+
+def _collect_names(body, names):
+    """Add names bound by a block of statements; False if a star import makes the scan inconclusive"""
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for sub in ast.walk(target):
+                    if isinstance(sub, ast.Name):
+                        names.add(sub.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    return False
+                names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.If):
+            # e.g. names defined under a version or feature check
+            if not (_collect_names(node.body, names) and _collect_names(node.orelse, names)):
+                return False
+        elif isinstance(node, ast.Try):
+            # e.g. the try/except ImportError optional-dependency idiom
+            blocks = [node.body, node.orelse, node.finalbody] + [handler.body for handler in node.handlers]
+            if not all(_collect_names(block, names) for block in blocks):
+                return False
+    return True
+
+
+def _scan_defined_names(origin):
+    """Collect module-level names bound in a source file, or None if a star import makes the scan inconclusive"""
+    with open(origin, "rb") as f:
+        tree = ast.parse(f.read(), filename=origin)
+
+    names = set()
+    return names if _collect_names(tree.body, names) else None
+
+
+def _missing_from(names):
+    """Sorted required names absent from a set of names (or a namespace's keys())"""
+    if names >= _REQUIRED_FUNCTIONS:
+        return ()
+    return tuple(sorted(_REQUIRED_FUNCTIONS - names))
+
+
+@lru_cache(maxsize=8)
+def _check(origin, mtime):
+    """Missing required names for a source file revision, or None if the scan is inconclusive"""
+    names = _scan_defined_names(origin)
+    return None if names is None else _missing_from(names)
+
+
+def _missing_shared_exports():
+    """Return (load status, sorted missing names) for the shared module"""
+    modules = sys.modules
+    shared_module = modules.get(SHARED_MODULE)
+    missing_functions = None
+    
+    if shared_module is not None:
+        # Already loaded in this process: its namespace is authoritative
+        missing_functions = _missing_from(vars(shared_module).keys())
+        status = _MSG_ALREADY_LOADED
+    else:
+        # Locate the shared module without executing its top-level code
+        spec = _find_spec(SHARED_MODULE)
+        if spec is None:
+            raise ImportError(f"No module named '{SHARED_MODULE}'")
+        
+        if spec.origin and spec.origin.endswith(".py"):
+            # Keyed on mtime so edits to the shared module invalidate the cached result
+            missing_functions = _check(spec.origin, os.path.getmtime(spec.origin))
+        
+        if missing_functions is None:
+            # Star imports or non-source modules: fall back to a real import
+            shared_module = import_module(SHARED_MODULE)
+            status = _MSG_IMPORTED
+            missing_functions = _missing_from(vars(shared_module).keys())
+        else:
+            status = _MSG_PARSED
+    
+    return status, missing_functions
+
+
+def test_shared_module_exports():
+    """Test that the shared module defines every required function"""
+    if SHARED_MODULE not in sys.modules and _find_spec(SHARED_MODULE) is None:
+        pytest.skip(f"{SHARED_MODULE} is not present in this tree")
+    _, missing_functions = _missing_shared_exports()
+    assert not missing_functions, f"Missing functions: {list(missing_functions)}"
+
+
+def main():
+    """Run the check as a script, printing a short report"""
+    try:
+        status, missing_functions = _missing_shared_exports()
+    except (ImportError, AttributeError, SyntaxError) as e:
+        print(_MSG_IMPORT_ERROR, e)
+        return False
+    
+    stdout_write = sys.stdout.write
+    if missing_functions:
+        stdout_write(f"{status}\n{_MSG_MISSING} {list(missing_functions)}\n")
+        return False
+    stdout_write(f"{status}\n{_MSG_ALL_FOUND}\n")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    if success:
+        print(_MSG_SUCCESS)
+    sys.exit(0 if success else 1)
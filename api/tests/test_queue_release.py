@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Checks that releasing a finished queue request never changes objects callers still hold
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root (two levels above api/tests) to the Python path, once
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+queues_service = pytest.importorskip("api.services.ai.runpod.queues_service")
+
+
+def test_released_request_is_not_reused():
+    async def scenario():
+        manager = queues_service.UnifiedQueueManager()
+
+        first_id = await manager.add_workflow_request("llm-mistral", {"prompt": "first"})
+        held = (await manager.dequeue_pending("llm-mistral"))[0]
+        manager.mark_request_completed(first_id, {"text": "first result"})
+        assert manager.release_request(first_id)
+
+        second_id = await manager.add_workflow_request("llm-mistral", {"prompt": "second"})
+        return manager, held, first_id, second_id
+
+    manager, held, first_id, second_id = asyncio.run(scenario())
+
+    assert manager.get_request(second_id) is not held
+    assert held.id == first_id
+    assert held.inputs == {"prompt": "first"}
+    assert held.status == "completed"
+    assert held.result == {"text": "first result"}
+
+
+def test_release_before_dequeue_leaves_a_tombstone():
+    async def scenario():
+        manager = queues_service.UnifiedQueueManager()
+
+        done_id = await manager.add_workflow_request("llm-mistral", {"prompt": "done"})
+        live_id = await manager.add_workflow_request("llm-mistral", {"prompt": "live"})
+        queue = manager.pendingRequests["llm-mistral"]
+        manager.mark_request_completed(done_id, "early")
+        assert manager.release_request(done_id)
+
+        assert manager.pendingRequests["llm-mistral"] is queue
+        assert [r["id"] for r in manager.get_queue_status().pendingRequests["llm-mistral"]] == [live_id]
+        return [r.id for r in await manager.dequeue_pending("llm-mistral")], live_id
+
+    taken, live_id = asyncio.run(scenario())
+    assert taken == [live_id]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Checks that batched samples in scripts/quick_db_view.py render like typed rows
+"""
+
+import importlib.util
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts", "quick_db_view.py"
+)
+_spec = importlib.util.spec_from_file_location("quick_db_view", SCRIPT_PATH)
+quick_db_view = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(quick_db_view)
+
+COLUMN_TYPES = {
+    "created_at": "timestamp with time zone",
+    "updated_at": "timestamp without time zone",
+    "price": "numeric",
+    "ratio": "double precision",
+    "meta": "jsonb",
+    "note": "text",
+}
+
+
+def test_json_sample_row_keeps_typed_values():
+    row = quick_db_view._decode_row(
+        '{"created_at": "2024-05-01T10:00:00.123+00:00", "updated_at": "2024-05-01T10:00:00",'
+        ' "price": 12.50, "ratio": 0.5, "meta": {"score": 1.5}, "note": "2024-05-01T10:00:00"}',
+        COLUMN_TYPES,
+    )
+
+    assert isinstance(row["created_at"], datetime)
+    assert quick_db_view._format_value(row["created_at"]) == "2024-05-01 10:00"
+    assert quick_db_view._format_value(row["updated_at"]) == "2024-05-01 10:00"
+    assert row["price"] == Decimal("12.50")
+    assert row["ratio"] == 0.5 and isinstance(row["ratio"], float)
+    assert row["meta"] == {"score": 1.5}
+    assert row["note"] == "2024-05-01T10:00:00"
+
+
+def test_format_value_handles_subclasses():
+    from collections import OrderedDict
+
+    class LocalDateTime(datetime):
+        pass
+
+    assert quick_db_view._format_value(LocalDateTime(2024, 5, 1, 10, 0)) == "2024-05-01 10:00"
+    assert quick_db_view._format_value(OrderedDict(a=1)).startswith('{\n  "a": 1')
+    assert quick_db_view._format_value(None) == "NULL"
+    assert quick_db_view._format_value("x" * 60) == "x" * 50
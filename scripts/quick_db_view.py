@@ -5,9 +5,12 @@ Simple script to quickly view database data without interactive prompts
 """
 
 import os
+import re
 import sys
 import json
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
@@ -28,38 +31,109 @@ def get_database_connection():
         print(f"❌ Failed to connect to database: {e}")
         sys.exit(1)
 
+# Per-type cell formatters; anything else is shown as a truncated string
+_FORMATTERS = {
+    datetime: lambda v: v.strftime("%Y-%m-%d %H:%M"),
+    dict: lambda v: json.dumps(v, indent=2)[:50] + "...",
+    type(None): lambda v: "NULL",
+}
+
+def _format_value(value):
+    formatter = _FORMATTERS.get(type(value))
+    if formatter is None:
+        # Subclasses (tz-aware datetime types, OrderedDict, ...) miss the exact-type lookup
+        formatter = next((f for t, f in _FORMATTERS.items() if isinstance(value, t)), None)
+    return formatter(value) if formatter else str(value)[:50]
+
+def print_table(table_name, rows):
+    """Print sample rows of a table"""
+    print(f"\n📊 {table_name.upper()} (showing {len(rows)} rows)")
+    print("-" * 60)
+    
+    if not rows:
+        print("  (empty table)")
+        return
+    
+    # Display as simple table
+    for i, row in enumerate(rows, 1):
+        print(f"\nRow {i}:")
+        for col, value in row.items():
+            print(f"  {col}: {_format_value(value)}")
+
+def _quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+@lru_cache(maxsize=None)
+def _sample_statement(table_name, schema="public"):
+    """Build the sample query once per table so SQLAlchemy's compiled cache can reuse it"""
+    return text(f"SELECT * FROM {_quote_ident(schema)}.{_quote_ident(table_name)} LIMIT :lim")
+
 def quick_view_table(session, table_name, limit=10):
     """Quick view of table data"""
     try:
-        result = session.execute(text(f"SELECT * FROM {table_name} LIMIT {limit}"))
-        rows = result.fetchall()
-        columns = result.keys()
-        
-        print(f"\n📊 {table_name.upper()} (showing {len(rows)} rows)")
-        print("-" * 60)
-        
-        if not rows:
-            print("  (empty table)")
-            return
-        
-        # Display as simple table
-        for i, row in enumerate(rows, 1):
-            print(f"\nRow {i}:")
-            for col, value in zip(columns, row):
-                if isinstance(value, datetime):
-                    value = value.strftime("%Y-%m-%d %H:%M")
-                elif isinstance(value, dict):
-                    value = json.dumps(value, indent=2)[:50] + "..."
-                elif value is None:
-                    value = "NULL"
-                else:
-                    value = str(value)[:50]
-                
-                print(f"  {col}: {value}")
+        rows = session.execute(_sample_statement(table_name), {"lim": limit}).mappings().fetchall()
+        print_table(table_name, rows)
         
     except Exception as e:
         print(f"❌ Error reading {table_name}: {e}")
 
+# row_to_json renders timestamps as ISO 8601 with 0-6 fractional digits
+_TIMESTAMP_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d{1,6}))?([+-]\d{2}:\d{2})?$")
+
+def _parse_timestamp(value):
+    match = _TIMESTAMP_RE.match(value)
+    if not match:
+        return value
+    # Pad the fraction: datetime.fromisoformat only takes 3 or 6 digits before Python 3.11
+    base, fraction, offset = match.groups()
+    return datetime.fromisoformat(f"{base}.{(fraction or '').ljust(6, '0')}{offset or ''}")
+
+def _as_float(value):
+    """Undo parse_float=Decimal inside json/jsonb values"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: _as_float(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_as_float(v) for v in value]
+    return value
+
+def _decode_row(row_json, column_types):
+    """Decode a row_to_json row, restoring the Python types a typed SELECT would return"""
+    row = json.loads(row_json, parse_float=Decimal)
+    for col, value in row.items():
+        data_type = column_types.get(col, "")
+        if data_type.startswith("timestamp") and isinstance(value, str):
+            row[col] = _parse_timestamp(value)
+        elif data_type != "numeric":
+            row[col] = _as_float(value)
+    return row
+
+def fetch_table_samples(session, tables, limit=10):
+    """Fetch sample rows of every table with two queries, however many tables there are"""
+    selects = [
+        f"(SELECT CAST(:t{i} AS text) AS __table, row_to_json(s)::text AS __row "
+        f"FROM (SELECT * FROM {_quote_ident('public')}.{_quote_ident(table)} LIMIT :lim) s)"
+        for i, table in enumerate(tables)
+    ]
+    params = {f"t{i}": table for i, table in enumerate(tables)}
+    params["lim"] = limit
+    
+    # Column types let the JSON rows be decoded back into datetimes and Decimals
+    column_types = {table: {} for table in tables}
+    for table, column, data_type in session.execute(text("""
+        SELECT table_name, column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+    """)):
+        if table in column_types:
+            column_types[table][column] = data_type
+    
+    samples = {table: [] for table in tables}
+    for table, row in session.execute(text(" UNION ALL ".join(selects)), params):
+        samples[table].append(_decode_row(row, column_types[table]))
+    return samples
+
 def main():
     """Quick database view"""
     print("🔍 Quick Database View")
@@ -78,9 +152,21 @@ def main():
         
         print(f"📋 Found {len(tables)} tables: {', '.join(tables)}")
         
+        if not tables:
+            return
+        
         # Show each table
+        try:
+            samples = fetch_table_samples(session, tables)
+        except Exception as e:
+            print(f"⚠️  Batched read failed ({e}), reading tables one by one")
+            session.rollback()
+            for table in tables:
+                quick_view_table(session, table)
+            return
+        
         for table in tables:
-            quick_view_table(session, table)
+            print_table(table, samples[table])
         
     except Exception as e:
         print(f"❌ Error: {e}")
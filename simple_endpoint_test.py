@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 """
 Simple API Endpoint Testing Script
-Uses built-in libraries to test endpoints
+Uses a pooled httpx client to test endpoints concurrently
 """
 
-import urllib.request
-import urllib.parse
-import urllib.error
+import asyncio
 import json
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_dumps = orjson.dumps if orjson else (lambda obj: json.dumps(obj).encode('utf-8'))
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps_indented(obj):
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
 
 # Configuration
 BASE_URL = "http://localhost:8000"
@@ -22,8 +35,13 @@ class SimpleEndpointTester:
         self.base_url = base_url
         self.auth_token = None
         self.test_results = {}
+        self._client = None
+        self._report = None
+        self.report_file = None
+        self._wall_anchor = datetime.now()
+        self._perf_anchor_ns = time.perf_counter_ns()
         
-    def make_request(self, method: str, endpoint: str, data=None, headers=None):
+    async def make_request(self, method: str, endpoint: str, data=None, headers=None):
         """Make HTTP request and return response data"""
         url = f"{self.base_url}{endpoint}"
         
@@ -36,59 +54,53 @@ class SimpleEndpointTester:
             
         # Add content type for JSON data
         if data and isinstance(data, dict):
-            data = json.dumps(data).encode('utf-8')
+            data = _json_dumps(data)
             headers['Content-Type'] = 'application/json'
         elif data and isinstance(data, str):
             data = data.encode('utf-8')
             
         try:
-            req = urllib.request.Request(url, data=data, headers=headers, method=method)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                response_data = response.read().decode('utf-8')
-                try:
-                    json_data = json.loads(response_data)
-                except:
-                    json_data = {"text": response_data}
-                    
-                return {
-                    "status": response.status,
-                    "data": json_data,
-                    "headers": dict(response.headers),
-                    "url": url
-                }
-        except urllib.error.HTTPError as e:
-            try:
-                error_data = e.read().decode('utf-8')
-                json_data = json.loads(error_data)
-            except:
-                json_data = {"text": error_data}
-            return {
-                "status": e.code,
-                "data": json_data,
-                "url": url,
-                "error": str(e)
-            }
+            response = await self._client.request(method, endpoint, content=data, headers=headers)
         except Exception as e:
             return {
                 "status": 0,
                 "error": str(e),
                 "url": url
             }
+        
+        try:
+            json_data = _json_loads(response.content)
+        except ValueError:
+            json_data = {"text": response.text}
+        
+        if response.is_error:
+            return {
+                "status": response.status_code,
+                "data": json_data,
+                "url": url,
+                "error": f"HTTP Error {response.status_code}: {response.reason_phrase}"
+            }
+        return {
+            "status": response.status_code,
+            "data": json_data,
+            "headers": dict(response.headers),
+            "url": url
+        }
     
-    def test_endpoint(self, name: str, method: str, endpoint: str, expected_status: int = 200, data=None, headers=None):
+    async def test_endpoint(self, name: str, method: str, endpoint: str, expected_status: int = 200, data=None, headers=None):
         """Test a single endpoint"""
         print(f"Testing {name}: {method} {endpoint}")
         
-        start_time = time.time()
-        result = self.make_request(method, endpoint, data, headers)
-        end_time = time.time()
+        start_ns = time.perf_counter_ns()
+        result = await self.make_request(method, endpoint, data, headers)
         
         result["test_name"] = name
         result["method"] = method
         result["endpoint"] = endpoint
         result["expected_status"] = expected_status
-        result["response_time"] = end_time - start_time
-        result["timestamp"] = datetime.now().isoformat()
+        result["response_time"] = (time.perf_counter_ns() - start_ns) / 1e9
+        # Wall-clock timestamp is derived from start_ns when the report is written
+        result["_start_ns"] = start_ns
         
         # Check if test passed
         if result["status"] == expected_status:
@@ -102,12 +114,12 @@ class SimpleEndpointTester:
         
         return result
     
-    def authenticate(self):
+    async def authenticate(self):
         """Authenticate and get token"""
         print("🔐 Authenticating...")
         
         # Try to register first
-        register_result = self.test_endpoint(
+        register_result = await self.test_endpoint(
             "User Registration",
             "POST",
             "/api/auth/register",
@@ -120,7 +132,7 @@ class SimpleEndpointTester:
         )
         
         # Try to login
-        login_result = self.test_endpoint(
+        login_result = await self.test_endpoint(
             "User Login",
             "POST",
             "/api/auth/login",
@@ -139,7 +151,7 @@ class SimpleEndpointTester:
             print(f"❌ Authentication failed")
             return False
     
-    def test_health_endpoints(self):
+    async def test_health_endpoints(self):
         """Test health and basic endpoints"""
         print("\n🏥 Testing Health Endpoints...")
         
@@ -150,11 +162,14 @@ class SimpleEndpointTester:
             ("OpenAPI Schema", "GET", "/openapi.json", 200),
         ]
         
-        for name, method, endpoint, expected_status in endpoints:
-            result = self.test_endpoint(name, method, endpoint, expected_status)
-            self.test_results[f"health_{name.lower().replace(' ', '_')}"] = result
+        results = await asyncio.gather(*[
+            self.test_endpoint(name, method, endpoint, expected_status)
+            for name, method, endpoint, expected_status in endpoints
+        ])
+        for (name, *_), result in zip(endpoints, results):
+            self.record_result(f"health_{name.lower().replace(' ', '_')}", result)
     
-    def test_storage_endpoints(self):
+    async def test_storage_endpoints(self):
         """Test storage router endpoints"""
         print("\n📁 Testing Storage Endpoints...")
         
@@ -168,17 +183,13 @@ class SimpleEndpointTester:
             }),
         ]
         
-        for endpoint_data in endpoints:
-            name = endpoint_data[0]
-            method = endpoint_data[1]
-            endpoint = endpoint_data[2]
-            expected_status = endpoint_data[3]
-            data = endpoint_data[4] if len(endpoint_data) > 4 else None
-            
-            result = self.test_endpoint(name, method, endpoint, expected_status, data)
-            self.test_results[f"storage_{name.lower().replace(' ', '_')}"] = result
+        results = await asyncio.gather(*[
+            self.test_endpoint(*endpoint_data) for endpoint_data in endpoints
+        ])
+        for (name, *_), result in zip(endpoints, results):
+            self.record_result(f"storage_{name.lower().replace(' ', '_')}", result)
     
-    def test_analysis_endpoints(self):
+    async def test_analysis_endpoints(self):
         """Test analysis endpoints"""
         print("\n🔍 Testing Analysis Endpoints...")
         
@@ -192,17 +203,13 @@ class SimpleEndpointTester:
             }),
         ]
         
-        for endpoint_data in endpoints:
-            name = endpoint_data[0]
-            method = endpoint_data[1]
-            endpoint = endpoint_data[2]
-            expected_status = endpoint_data[3]
-            data = endpoint_data[4] if len(endpoint_data) > 4 else None
-            
-            result = self.test_endpoint(name, method, endpoint, expected_status, data)
-            self.test_results[f"analysis_{name.lower().replace(' ', '_')}"] = result
+        results = await asyncio.gather(*[
+            self.test_endpoint(*endpoint_data) for endpoint_data in endpoints
+        ])
+        for (name, *_), result in zip(endpoints, results):
+            self.record_result(f"analysis_{name.lower().replace(' ', '_')}", result)
     
-    def test_credits_endpoints(self):
+    async def test_credits_endpoints(self):
         """Test credits endpoints"""
         print("\n💰 Testing Credits Endpoints...")
         
@@ -212,11 +219,14 @@ class SimpleEndpointTester:
             ("Credits Pricing Music", "GET", "/api/credits/pricing/music", 200),
         ]
         
-        for name, method, endpoint, expected_status in endpoints:
-            result = self.test_endpoint(name, method, endpoint, expected_status)
-            self.test_results[f"credits_{name.lower().replace(' ', '_')}"] = result
+        results = await asyncio.gather(*[
+            self.test_endpoint(name, method, endpoint, expected_status)
+            for name, method, endpoint, expected_status in endpoints
+        ])
+        for (name, *_), result in zip(endpoints, results):
+            self.record_result(f"credits_{name.lower().replace(' ', '_')}", result)
     
-    def test_ai_endpoints(self):
+    async def test_ai_endpoints(self):
         """Test AI service endpoints"""
         print("\n🤖 Testing AI Endpoints...")
         
@@ -226,33 +236,66 @@ class SimpleEndpointTester:
             ("ComfyUI Workflows", "GET", "/api/comfyui/workflows", 200),
         ]
         
-        for name, method, endpoint, expected_status in endpoints:
-            result = self.test_endpoint(name, method, endpoint, expected_status)
-            self.test_results[f"ai_{name.lower().replace(' ', '_')}"] = result
+        results = await asyncio.gather(*[
+            self.test_endpoint(name, method, endpoint, expected_status)
+            for name, method, endpoint, expected_status in endpoints
+        ])
+        for (name, *_), result in zip(endpoints, results):
+            self.record_result(f"ai_{name.lower().replace(' ', '_')}", result)
     
-    def run_all_tests(self):
+    def record_result(self, key: str, result):
+        """Store a test result and append it to the report file"""
+        start_ns = result.pop("_start_ns", None)
+        if start_ns is not None:
+            offset = timedelta(microseconds=(start_ns - self._perf_anchor_ns) / 1000)
+            result["timestamp"] = (self._wall_anchor + offset).isoformat()
+        
+        self.test_results[key] = result
+        if self._report is not None:
+            separator = b"\n" if len(self.test_results) == 1 else b",\n"
+            self._report.write(separator + _json_dumps(key) + b": " + _json_dumps_indented(result))
+    
+    async def run_all_tests(self):
         """Run all endpoint tests"""
         print("🚀 Starting Simple API Endpoint Testing")
         print(f"Base URL: {self.base_url}")
         print("=" * 60)
         
-        # Test health endpoints first (no auth required)
-        self.test_health_endpoints()
-        
-        # Authenticate
-        auth_success = self.authenticate()
-        if not auth_success:
-            print("❌ Authentication failed, skipping authenticated endpoints")
-            return
-        
-        # Test authenticated endpoints
-        self.test_storage_endpoints()
-        self.test_analysis_endpoints()
-        self.test_credits_endpoints()
-        self.test_ai_endpoints()
+        # Results are written as they complete so a crashed run still leaves a report
+        self.report_file = f"simple_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self._report = open(self.report_file, 'wb')
+        self._report.write(b"{")
         
-        # Generate report
-        self.generate_report()
+        try:
+            async with httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            ) as self._client:
+                # Test health endpoints first (no auth required)
+                await self.test_health_endpoints()
+                
+                # Authenticate
+                auth_success = await self.authenticate()
+                if not auth_success:
+                    print("❌ Authentication failed, skipping authenticated endpoints")
+                    return
+                
+                # Test authenticated endpoints (independent groups run concurrently)
+                await asyncio.gather(
+                    self.test_storage_endpoints(),
+                    self.test_analysis_endpoints(),
+                    self.test_credits_endpoints(),
+                    self.test_ai_endpoints(),
+                )
+            
+            # Generate report
+            self.generate_report()
+        finally:
+            self._report.write(b"\n}\n")
+            self._report.close()
+            self._report = None
     
     def generate_report(self):
         """Generate test report"""
@@ -277,11 +320,7 @@ class SimpleEndpointTester:
                     if "error" in result:
                         print(f"    Error: {result['error']}")
         
-        # Save detailed report
-        report_file = f"simple_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2)
-        print(f"\n📄 Detailed report saved to: {report_file}")
+        print(f"\n📄 Detailed report saved to: {self.report_file}")
 
 def main():
     """Main function"""
@@ -291,7 +330,7 @@ def main():
         base_url = BASE_URL
     
     tester = SimpleEndpointTester(base_url)
-    tester.run_all_tests()
+    asyncio.run(tester.run_all_tests())
 
 if __name__ == "__main__":
     main()